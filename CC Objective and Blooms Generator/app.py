@@ -2,14 +2,11 @@ import streamlit as st
 import pandas as pd
 import json
 import re
-from typing import Optional, Dict, Any
-from dataclasses import dataclass
-from openai import OpenAI
+from typing import Dict, Any
+from planner import GenerationRequest, generate_plan
 
 # === SETTINGS ===
 CSV_PATH = r"C:\Users\jdevi\OneDrive\Desktop\curriculum\ccc (1).csv"
-DEFAULT_MODEL = "gpt-4o-mini"
-LEARNING_STYLE_TAGS = "[visual, auditory, kinesthetic, reading/writing, collaborative, independent]"
 
 st.set_page_config(page_title="Standards, Objectives, Bloom's Taxonomy of Learning by CC Standards", layout="centered")
 
@@ -100,85 +97,6 @@ with tab1:
         with st.spinner("Generating your learning plan..."):
             row = filtered_df[filtered_df["combo"] == selected_combo].iloc[0]
 
-            @dataclass
-            class GenerationRequest:
-                grade: str
-                subject: str
-                state: str = ""
-                standard: Optional[str] = None
-                standard_code: Optional[str] = None
-                domain: Optional[str] = None
-                strand: Optional[str] = None
-                subcategory: Optional[str] = None
-                description: Optional[str] = None
-
-            JSON_TARGET = {
-                "curriculum_developer": {
-                    "objectives": {"knowledge": [], "skills": []},
-                    "benchmarks": []
-                },
-                "student_friendly": {
-                    "goals": [], "ican_statements": [], "how_ill_show_learning": []
-                },
-                "blooms_taxonomy_activities": {
-                    "remembering": [], "understanding": [], "applying": [],
-                    "analyzing": [], "evaluating": [], "creating": []
-                }
-            }
-
-            def build_prompt(req: GenerationRequest) -> str:
-                extras = []
-                if req.standard_code: extras.append(f"Standard Code: {req.standard_code}")
-                if req.domain: extras.append(f"Domain: {req.domain}")
-                if req.strand: extras.append(f"Strand: {req.strand}")
-                if req.subcategory: extras.append(f"Subcategory: {req.subcategory}")
-                if req.description: extras.append(f"Description: {req.description}")
-                extra_text = "\n".join(extras)
-
-                return f"""
-You are an expert curriculum developer and instructional designer.
-
-Goal: Generate educational content tailored to {req.grade}.
-
-Context:
-Grade: {req.grade}
-Subject: {req.subject}
-State: {req.state}
-Standard: {req.standard}
-{extra_text}
-
-OUTPUT SPECIFICATION — return ONLY valid JSON exactly matching this schema:
-{json.dumps(JSON_TARGET, indent=2)}
-
-CONTENT REQUIREMENTS
-1) Objectives (SWBAT):
-   - Write 3–5 objectives beginning with "SWBAT ..."
-   - Each objective must include: a condition/context, a measurable Bloom-aligned verb, the specific content/knowledge, and a success criterion (e.g., "with 80% accuracy", "in a 150-word response", "using correct terminology").
-   - Put knowledge elements in "knowledge" and the behaviors in "skills".
-
-2) Benchmarks (Measurable):
-   - For each objective, provide 1–2 measurable benchmarks that include the assessment method (quiz, rubric, exit ticket, performance task) and a clear threshold for success (e.g., "4/5 correct", "meets rubric level 3+").
-
-3) Student-Friendly Version (developmentally appropriate for {req.grade}):
-   - "goals": 3–5 plain-language goals.
-   - "ican_statements": 4–6 "I can ..." statements aligned to the objectives.
-   - "how_ill_show_learning": 4–6 ways students can demonstrate learning, including at least TWO digital artifacts.
-
-4) Bloom’s Taxonomy Activities:
-   - Provide EXACTLY 2 activities for each level: remembering, understanding, applying, analyzing, evaluating, creating.
-   - Each activity must be a single concise string using this format:
-     "Activity: <what students do>. Modalities: [choose from {LEARNING_STYLE_TAGS}]. Online: <platform(s) + brief directions>. Offline: <materials/alternative>."
-   - Choose widely available, classroom-friendly platforms ONLY (names only, no URLs): Google Docs/Slides, Padlet, Nearpod, Pear Deck, Flip, Quizizz, Kahoot!, Edpuzzle, CommonLit, Newsela, FigJam, Miro, Canva, Smithsonian Learning Lab, Library of Congress.
-   - Integrate tasteful Fine Arts options when relevant.
-
-GENERAL RULES
-- Match the developmental level of {req.grade}
-- Use inclusive, accessible language
-- Vary modalities
-- Keep items concise (≤ 26 words)
-- Output ONLY the JSON
-""".strip()
-
             req = GenerationRequest(
                 grade=grade,
                 subject=subject,
@@ -188,19 +106,8 @@ GENERAL RULES
                 description=row.get("Description", "")
             )
 
-            client = OpenAI(api_key=api_key)
             try:
-                res = client.chat.completions.create(
-                    model=DEFAULT_MODEL,
-                    response_format={"type": "json_object"},
-                    temperature=0.2,
-                    messages=[
-                        {"role": "system", "content": "Return ONLY a JSON object. No markdown, no commentary."},
-                        {"role": "user", "content": build_prompt(req)},
-                    ],
-                )
-                content = res.choices[0].message.content
-                plan = json.loads(content)
+                plan = generate_plan(req, api_key)
             except Exception as e:
                 st.error(f"Error: {str(e)}")
                 st.stop()
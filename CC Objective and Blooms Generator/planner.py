@@ -0,0 +1,126 @@
+import json
+from typing import Optional, Dict, Any
+from dataclasses import dataclass
+from openai import OpenAI, DefaultHttpxClient
+
+# Times the plan request when the portfolio's `ai_metrics` package is on PYTHONPATH
+# (AI_METRICS_TRACE=trace.jsonl writes a trace).
+try:
+    from ai_metrics import span, httpx_event_hooks
+except ImportError:  # Streamlit Cloud deploys this folder alone: run untimed
+    from contextlib import nullcontext
+    from types import SimpleNamespace
+
+    def span(tool, op, **labels):
+        return nullcontext(SimpleNamespace(record_usage=lambda usage: None))
+
+    def httpx_event_hooks():
+        return {}
+
+# === SETTINGS ===
+DEFAULT_MODEL = "gpt-4o-mini"
+LEARNING_STYLE_TAGS = "[visual, auditory, kinesthetic, reading/writing, collaborative, independent]"
+
+
+@dataclass
+class GenerationRequest:
+    grade: str
+    subject: str
+    state: str = ""
+    standard: Optional[str] = None
+    standard_code: Optional[str] = None
+    domain: Optional[str] = None
+    strand: Optional[str] = None
+    subcategory: Optional[str] = None
+    description: Optional[str] = None
+
+
+JSON_TARGET = {
+    "curriculum_developer": {
+        "objectives": {"knowledge": [], "skills": []},
+        "benchmarks": []
+    },
+    "student_friendly": {
+        "goals": [], "ican_statements": [], "how_ill_show_learning": []
+    },
+    "blooms_taxonomy_activities": {
+        "remembering": [], "understanding": [], "applying": [],
+        "analyzing": [], "evaluating": [], "creating": []
+    }
+}
+
+
+def build_prompt(req: GenerationRequest) -> str:
+    extras = []
+    if req.standard_code: extras.append(f"Standard Code: {req.standard_code}")
+    if req.domain: extras.append(f"Domain: {req.domain}")
+    if req.strand: extras.append(f"Strand: {req.strand}")
+    if req.subcategory: extras.append(f"Subcategory: {req.subcategory}")
+    if req.description: extras.append(f"Description: {req.description}")
+    extra_text = "\n".join(extras)
+
+    return f"""
+You are an expert curriculum developer and instructional designer.
+
+Goal: Generate educational content tailored to {req.grade}.
+
+Context:
+Grade: {req.grade}
+Subject: {req.subject}
+State: {req.state}
+Standard: {req.standard}
+{extra_text}
+
+OUTPUT SPECIFICATION — return ONLY valid JSON exactly matching this schema:
+{json.dumps(JSON_TARGET, indent=2)}
+
+CONTENT REQUIREMENTS
+1) Objectives (SWBAT):
+   - Write 3–5 objectives beginning with "SWBAT ..."
+   - Each objective must include: a condition/context, a measurable Bloom-aligned verb, the specific content/knowledge, and a success criterion (e.g., "with 80% accuracy", "in a 150-word response", "using correct terminology").
+   - Put knowledge elements in "knowledge" and the behaviors in "skills".
+
+2) Benchmarks (Measurable):
+   - For each objective, provide 1–2 measurable benchmarks that include the assessment method (quiz, rubric, exit ticket, performance task) and a clear threshold for success (e.g., "4/5 correct", "meets rubric level 3+").
+
+3) Student-Friendly Version (developmentally appropriate for {req.grade}):
+   - "goals": 3–5 plain-language goals.
+   - "ican_statements": 4–6 "I can ..." statements aligned to the objectives.
+   - "how_ill_show_learning": 4–6 ways students can demonstrate learning, including at least TWO digital artifacts.
+
+4) Bloom’s Taxonomy Activities:
+   - Provide EXACTLY 2 activities for each level: remembering, understanding, applying, analyzing, evaluating, creating.
+   - Each activity must be a single concise string using this format:
+     "Activity: <what students do>. Modalities: [choose from {LEARNING_STYLE_TAGS}]. Online: <platform(s) + brief directions>. Offline: <materials/alternative>."
+   - Choose widely available, classroom-friendly platforms ONLY (names only, no URLs): Google Docs/Slides, Padlet, Nearpod, Pear Deck, Flip, Quizizz, Kahoot!, Edpuzzle, CommonLit, Newsela, FigJam, Miro, Canva, Smithsonian Learning Lab, Library of Congress.
+   - Integrate tasteful Fine Arts options when relevant.
+
+GENERAL RULES
+- Match the developmental level of {req.grade}
+- Use inclusive, accessible language
+- Vary modalities
+- Keep items concise (≤ 26 words)
+- Output ONLY the JSON
+""".strip()
+
+
+# === PLAN REQUEST ===
+# Kept free of Streamlit so it can also run headless (e.g. ai_metrics.replay);
+# base_url=None uses the OpenAI default / OPENAI_BASE_URL.
+def generate_plan(req: GenerationRequest, api_key: str, model: str = DEFAULT_MODEL,
+                  base_url: Optional[str] = None) -> Dict[str, Any]:
+    client = OpenAI(api_key=api_key, base_url=base_url,
+                    http_client=DefaultHttpxClient(event_hooks=httpx_event_hooks()))
+    with span("cc_objectives", "generate_plan", model=model) as call:
+        res = client.chat.completions.create(
+            model=model,
+            response_format={"type": "json_object"},
+            temperature=0.2,
+            messages=[
+                {"role": "system", "content": "Return ONLY a JSON object. No markdown, no commentary."},
+                {"role": "user", "content": build_prompt(req)},
+            ],
+        )
+        call.record_usage(res.usage)
+        content = res.choices[0].message.content
+        return json.loads(content)
@@ -0,0 +1,260 @@
+"""
+Headless backfill of AI reflections for historical journal entries.
+
+Entries saved without AI have `ai_reflection=None`. This job:
+- Streams entries from the JSONL journal (never loads the whole file).
+- Builds prompts with the existing `build_prompt` (via `ReflectionService`).
+- Generates reflections with bounded concurrency, retrying failures with
+  exponential backoff.
+- Checkpoints each finished reflection to `<journal>.backfill.jsonl` next
+  to the journal (`BACKFILL_CHECKPOINT_PATH` for the default journal), so an
+  interrupted run resumes where it stopped without paying for finished
+  entries again.
+- Writes all results back to the journal in one streaming rewrite at the end
+  (not one rewrite per entry), then removes the checkpoint.
+
+Entries are identified by their index in the journal, which is stable because
+the app only ever appends to it. Each checkpointed reflection also carries a
+fingerprint of the entry it was written for. If the journal was changed
+between runs (overwritten, hand-edited) and the entry at that index no longer
+matches, the stale reflection is discarded rather than attached to the wrong
+entry.
+
+Usage:
+    python -m app.ai.backfill --api-key sk-... [--user alice] [--concurrency 4] [--limit 100]
+"""
+
+import argparse
+import asyncio
+import hashlib
+import json
+import os
+import random
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+from app.config import (
+    JSONL_PATH, BACKFILL_CHECKPOINT_PATH, BACKFILL_CONCURRENCY, BACKFILL_MAX_RETRIES, AI_MODEL,
+    journal_path_for,
+)
+from app.data_models.journal import JournalEntry
+from app.storage import iter_entries_jsonl, rewrite_entries_jsonl
+from app.ai.reflection_service import ReflectionService
+from app.ai.metrics import span, TOOL
+
+
+@dataclass
+class BackfillStats:
+    """
+    Summary of one backfill run.
+
+    Attributes:
+        pending (int): Entries without a reflection that were queued this run.
+        generated (int): Reflections generated this run.
+        resumed (int): Reflections recovered from a previous run's checkpoint.
+        stale (int): Checkpointed reflections discarded because their entry changed.
+        failed (int): Entries that still failed after all retries.
+        written (int): Entries updated in the journal.
+    """
+
+    pending: int = 0
+    generated: int = 0
+    resumed: int = 0
+    stale: int = 0
+    failed: int = 0
+    written: int = 0
+
+
+def entry_fingerprint(entry: JournalEntry) -> str:
+    """
+    Identify an entry's content, ignoring its AI reflection.
+
+    Args:
+        entry (JournalEntry): The journal entry.
+
+    Returns:
+        str: Hex digest of the entry's fields other than `ai_reflection`.
+    """
+    fields = {k: v for k, v in entry.to_dict().items() if k != "ai_reflection"}
+    return hashlib.sha256(json.dumps(fields, sort_keys=True, ensure_ascii=False).encode("utf-8")).hexdigest()
+
+
+def checkpoint_path_for(path: Path) -> Path:
+    """
+    Location of the backfill checkpoint for a journal file.
+
+    Args:
+        path (Path): Journal JSONL file.
+
+    Returns:
+        Path: `<journal stem>.backfill.jsonl` in the same directory, so every
+              (per-user) journal resumes from its own checkpoint.
+    """
+    return path.with_name(path.stem + ".backfill.jsonl")
+
+
+def load_checkpoint(path: Path = BACKFILL_CHECKPOINT_PATH) -> Dict[int, Tuple[str, str]]:
+    """
+    Read reflections saved by an earlier (possibly interrupted) run.
+
+    A torn last line from a crash mid-write is ignored, as are records without
+    a fingerprint (they cannot be matched to an entry safely).
+
+    Args:
+        path (Path, optional): Checkpoint file. Defaults to `BACKFILL_CHECKPOINT_PATH`.
+
+    Returns:
+        Dict[int, Tuple[str, str]]: (entry fingerprint, reflection text) keyed by entry index.
+    """
+    done: Dict[int, Tuple[str, str]] = {}
+    if not path.exists():
+        return done
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            if record.get("fingerprint"):
+                done[record["index"]] = (record["fingerprint"], record["ai_reflection"])
+    return done
+
+
+async def _generate_with_retry(
+    service: ReflectionService, entry: JournalEntry, api_key: str, model: str, max_retries: int
+) -> Optional[str]:
+    """Return a reflection, or None if every attempt failed."""
+    with span(TOOL, "backfill_entry", model=model) as call:
+        for attempt in range(max_retries + 1):
+            if attempt:
+                call.retry()
+            text = await service.generate(entry, api_key, model)
+            if text and not text.startswith("[AI Error]"):
+                return text
+            if attempt < max_retries:
+                await asyncio.sleep(min(30.0, 2 ** attempt) * random.uniform(0.5, 1.0))
+        call.fail("retries exhausted")
+    return None
+
+
+async def backfill_reflections(
+    api_key: str,
+    path: Path = JSONL_PATH,
+    checkpoint_path: Optional[Path] = None,
+    concurrency: int = BACKFILL_CONCURRENCY,
+    max_retries: int = BACKFILL_MAX_RETRIES,
+    model: str = AI_MODEL,
+    limit: Optional[int] = None,
+    service: Optional[ReflectionService] = None,
+) -> BackfillStats:
+    """
+    Generate and store AI reflections for every entry that lacks one.
+
+    Args:
+        api_key (str): OpenAI API key.
+        path (Path, optional): Journal JSONL file. Defaults to `JSONL_PATH`.
+        checkpoint_path (Optional[Path], optional): Progress file used to resume.
+                                                    Defaults to `checkpoint_path_for(path)`.
+        concurrency (int, optional): Reflections generated in parallel.
+        max_retries (int, optional): Extra attempts per entry after a failure.
+        model (str, optional): Chat model. Defaults to `AI_MODEL`.
+        limit (Optional[int], optional): Generate at most this many new reflections.
+        service (Optional[ReflectionService], optional): Service to use (e.g. one
+                                                         pointed at a mock endpoint).
+
+    Returns:
+        BackfillStats: Counts for this run (all zero if the journal does not exist).
+    """
+    stats = BackfillStats()
+    if not path.exists():  # nothing saved yet (e.g. a user who never wrote an entry)
+        return stats
+    checkpoint_path = checkpoint_path or checkpoint_path_for(path)
+    done = load_checkpoint(checkpoint_path)
+    own_service = service is None
+    service = service or ReflectionService()
+    queue: asyncio.Queue = asyncio.Queue(maxsize=concurrency * 2)
+
+    with open(checkpoint_path, "a", encoding="utf-8") as checkpoint:
+        async def worker():
+            while True:
+                item = await queue.get()
+                if item is None:
+                    return
+                index, fingerprint, entry = item
+                text = await _generate_with_retry(service, entry, api_key, model, max_retries)
+                if text is None:
+                    stats.failed += 1
+                    continue
+                done[index] = (fingerprint, text)
+                stats.generated += 1
+                record = {"index": index, "fingerprint": fingerprint, "ai_reflection": text}
+                checkpoint.write(json.dumps(record, ensure_ascii=False) + "\n")
+                checkpoint.flush()
+
+        workers = [asyncio.create_task(worker()) for _ in range(concurrency)]
+        try:
+            for index, entry in enumerate(iter_entries_jsonl(path)):
+                if entry.ai_reflection:
+                    continue
+                fingerprint = entry_fingerprint(entry)
+                if index in done:
+                    if done[index][0] == fingerprint:
+                        stats.resumed += 1
+                        continue
+                    del done[index]  # written for an entry that is no longer here
+                    stats.stale += 1
+                if limit is not None and stats.pending >= limit:
+                    break
+                stats.pending += 1
+                await queue.put((index, fingerprint, entry))
+            for _ in workers:
+                await queue.put(None)
+            await asyncio.gather(*workers)
+        finally:
+            for task in workers:
+                task.cancel()
+            # Let cancelled workers finish before the checkpoint file closes
+            await asyncio.gather(*workers, return_exceptions=True)
+            if own_service:
+                await service.aclose()
+
+    if done:
+        def fill(index: int, entry: JournalEntry) -> JournalEntry:
+            if index in done and not entry.ai_reflection:
+                fingerprint, text = done[index]
+                if fingerprint == entry_fingerprint(entry):
+                    entry.ai_reflection = text
+                    stats.written += 1
+            return entry
+
+        rewrite_entries_jsonl(fill, path)
+    os.remove(checkpoint_path)
+    return stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Backfill AI reflections for saved journal entries.")
+    parser.add_argument("--api-key", default=os.getenv("OPENAI_API_KEY"), help="Defaults to $OPENAI_API_KEY")
+    parser.add_argument("--user", default=None, help="Backfill this user's journal (hosted mode)")
+    parser.add_argument("--path", type=Path, default=None, help="Journal file (overrides --user)")
+    parser.add_argument("--concurrency", type=int, default=BACKFILL_CONCURRENCY)
+    parser.add_argument("--retries", type=int, default=BACKFILL_MAX_RETRIES)
+    parser.add_argument("--model", default=AI_MODEL)
+    parser.add_argument("--limit", type=int, default=None, help="Max new reflections to generate")
+    args = parser.parse_args()
+    if not args.api_key:
+        parser.error("an OpenAI API key is required (--api-key or $OPENAI_API_KEY)")
+
+    path = args.path or journal_path_for(args.user)
+    if not path.exists():
+        print(f"No journal at {path}; nothing to backfill.")
+        return
+    stats = asyncio.run(backfill_reflections(
+        args.api_key, path, None, args.concurrency, args.retries, args.model, args.limit,
+    ))
+    print(f"✅ Backfill done: {stats.generated} generated, {stats.resumed} resumed, "
+          f"{stats.failed} failed, {stats.stale} stale discarded, {stats.written} entries updated.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,31 @@
+"""
+Latency and token instrumentation for the CBT Journal's AI calls.
+
+Re-exports the shared `ai_metrics` package from the portfolio repository root
+(add it to PYTHONPATH and set `AI_METRICS_TRACE=trace.jsonl` to record a
+trace). When it is not importable, e.g. when this project is deployed on its
+own, every hook below is a no-op and the app behaves exactly as before.
+"""
+
+try:
+    from ai_metrics import span, httpx_event_hooks, async_httpx_event_hooks
+except ImportError:  # shared instrumentation not installed: run without metrics
+    from contextlib import nullcontext
+
+    class _NoMetrics:
+        """Stand-in `Call` whose methods (first_byte, record_usage, ...) do nothing."""
+
+        def __getattr__(self, name):
+            return lambda *args, **kwargs: None
+
+    def span(tool, op, **labels):
+        return nullcontext(_NoMetrics())
+
+    def httpx_event_hooks():
+        return {}
+
+    def async_httpx_event_hooks():
+        return {}
+
+#: Tool name recorded on every span from this app.
+TOOL = "cbt_journal"
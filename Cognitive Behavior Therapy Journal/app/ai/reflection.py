@@ -0,0 +1,166 @@
+"""
+AI reflection utilities for the CBT Journal app.
+
+This version strengthens the prompt with:
+- Clear guardrails (non-clinical, trauma-informed, LGBTQ+ affirming, no diagnoses).
+- Deeper explanations of cognitive distortions & emotional meaning.
+- Evidence-for/against review, *three* alternative reframes, and a tiny next-step.
+- Crisis language guidelines if intensity is very high or risk language appears.
+
+Output is structured, concise, and compassionate.
+"""
+
+from functools import lru_cache
+from typing import List, Dict
+from openai import OpenAI, DefaultHttpxClient
+from app.config import AI_MODEL, AI_MAX_CLIENTS
+from app.data_models.journal import JournalEntry
+from app.ai.metrics import span, httpx_event_hooks, TOOL
+
+#: System message shared by the sync and streaming reflection paths.
+SYSTEM_PROMPT = (
+    "You are a compassionate, CBT-informed helper. "
+    "Use supportive, non-judgmental, inclusive language. "
+    "Be LGBTQ+ affirming and trauma-informed. "
+    "Do NOT diagnose, pathologize, or give medical/legal advice. "
+    "If entry suggests risk (self-harm/others-harm) or intensity is very high, "
+    "encourage seeking immediate human support and crisis resources in a gentle way. "
+    "Avoid moralizing language and 'shoulds'. "
+    "Keep the tone warm and clear; keep sections concise."
+)
+
+#: Sampling temperature for reflections.
+TEMPERATURE = 0.6
+
+
+@lru_cache(maxsize=AI_MAX_CLIENTS)
+def get_client(api_key: str) -> OpenAI:
+    """
+    Return a pooled OpenAI client for the given API key.
+
+    Building a client sets up a fresh HTTP connection pool, so clients are
+    cached (one per key) and reused across clicks.
+
+    Args:
+        api_key (str): OpenAI API key.
+
+    Returns:
+        OpenAI: A client bound to `api_key`.
+    """
+    return OpenAI(api_key=api_key, http_client=DefaultHttpxClient(event_hooks=httpx_event_hooks()))
+
+
+def build_messages(entry: JournalEntry) -> List[Dict[str, str]]:
+    """
+    Build the chat messages (system + user prompt) for a journal entry.
+
+    Args:
+        entry (JournalEntry): The journal entry to reflect on.
+
+    Returns:
+        List[Dict[str, str]]: Messages ready for `chat.completions.create`.
+    """
+    return [
+        {"role": "system", "content": SYSTEM_PROMPT},
+        {"role": "user", "content": build_prompt(entry)},
+    ]
+
+
+def generate_reflection(entry: JournalEntry, api_key: str, model: str = AI_MODEL) -> str:
+    """
+    Generate an AI-based reflection for a journal entry using a structured,
+    safety-aware prompt that returns practical and compassionate feedback.
+
+    This is the blocking variant; the UI uses the streaming
+    `app.ai.reflection_service.ReflectionService` instead.
+
+    Args:
+        entry (JournalEntry): User entry with event, thought, emotions, distortion, reframe, intensity (1–7).
+        api_key (str): OpenAI API key.
+        model (str, optional): Chat model. Defaults to "gpt-4o-mini".
+
+    Returns:
+        str: The formatted reflection. On failure, returns a message prefixed with "[AI Error]".
+    """
+    try:
+        with span(TOOL, "reflection", model=model, stream=False) as call:
+            response = get_client(api_key).chat.completions.create(
+                model=model,
+                temperature=TEMPERATURE,
+                messages=build_messages(entry),
+            )
+            call.record_usage(response.usage)
+        return (response.choices[0].message.content or "").strip()
+    except Exception as e:
+        return f"[AI Error] {str(e)}"
+
+
+def build_prompt(entry: JournalEntry) -> str:
+    """
+    Build a structured prompt from a JournalEntry that elicits
+    deeper insight, safeguards, and practical next steps.
+
+    Args:
+        entry (JournalEntry): The journal entry to transform.
+
+    Returns:
+        str: A formatted prompt with explicit sections and constraints for the model.
+    """
+    emotions_path = entry.emotion_primary
+    if entry.emotion_secondary:
+        emotions_path += f" → {entry.emotion_secondary}"
+    if entry.emotion_tertiary:
+        emotions_path += f" → {entry.emotion_tertiary}"
+
+    # Gentle guardrail hints for detection
+    risk_hint = (
+        "Note: If you notice language that suggests self-harm, hopelessness, "
+        "or danger to self/others, include the 'Gentle Safety Note' section."
+    )
+
+    # Clear, structured output request
+    return f"""
+I am practicing cognitive behavioral therapy. Here is my journal entry:
+
+• Date: {entry.date}
+• Event: {entry.event}
+• Automatic Thought: {entry.thought}
+• Emotion(s): {emotions_path}
+• Intensity: {entry.emotion_intensity}/7
+• Identified Distortion: {entry.cbt_distortion}
+• My Current Reframe: {entry.reframing}
+
+Please respond with the following SECTIONS (use these exact headings). Keep total length about 180–300 words, concise but caring.
+
+1) Warm Reflection
+- 2–3 sentences validating the experience. Use inclusive, non-clinical language.
+
+2) Distortion Deep-Dive
+- Name the distortion in plain words and briefly explain how it typically shows up.
+- Map that explanation to THIS entry with 1–2 concrete, specific links to the thought/event.
+
+3) Emotion Check
+- What might this emotion be trying to signal or protect?
+- Normalize the reported intensity ({entry.emotion_intensity}/7) in one sentence.
+- Offer ONE quick grounding or regulation step (e.g., paced breathing, brief movement, or self-talk).
+
+4) Evidence Scan
+- Two short bullets of evidence that SUPPORT the automatic thought.
+- Two short bullets of evidence that CHALLENGE the automatic thought.
+
+5) Balanced Reframe Options
+- Provide THREE alternative reframes (numbered). Each should be kind, realistic, and specific to THIS situation.
+- Begin each with phrases like “It’s possible that…”, “Another way to see this is…”, or “A fairer take might be…”.
+
+6) Tiny Next Step
+- Offer one next step that takes < 2 minutes and is within the user’s control.
+
+7) Gentle Safety Note (only if warranted)
+- {risk_hint}
+- If intensity seems ≥ 6/7 or risk language is present, write one brief, compassionate sentence encouraging reaching out to a trusted person or local resources. Do NOT include hotline numbers; suggest contacting local emergency services or a trusted clinician if in immediate danger.
+
+Constraints & Style:
+- No medical or diagnostic claims. No moralizing. No “should” statements directed at the user.
+- Be concrete and practical. Keep a warm, invitational tone.
+- Avoid filler like “as an AI”. Do not repeat the headings’ instructions; just produce the sections.
+""".strip()
@@ -0,0 +1,215 @@
+"""
+Async, streaming AI reflection service for the CBT Journal app.
+
+`ReflectionService` replaces the blocking `generate_reflection` call in the UI:
+- One `AsyncOpenAI` client is pooled per API key (LRU-bounded), so repeat
+  clicks reuse the same HTTP connection pool instead of building a new one.
+  A client evicted while it is still streaming is closed only once its last
+  reflection finishes.
+- Tokens are streamed as they arrive, so the "AI Reflection" box fills in
+  progressively and no Gradio worker thread is held while waiting.
+- Each reflection runs under a timeout budget: a limit on time-to-first-token
+  and an overall limit for the whole completion.
+- Cancellation (e.g. Gradio cancelling the event when the entry is edited)
+  closes the underlying HTTP stream immediately.
+- Each reflection is recorded as an `app.ai.metrics` span (latency, time to
+  first byte, token usage, client-pool hits).
+
+Errors are reported the same way as `generate_reflection`: as text prefixed
+with "[AI Error]".
+"""
+
+import asyncio
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Dict, Optional, Set
+from openai import AsyncOpenAI, DefaultAsyncHttpxClient
+from app.config import AI_MODEL, AI_FIRST_TOKEN_TIMEOUT, AI_TOTAL_TIMEOUT, AI_MAX_CLIENTS
+from app.data_models.journal import JournalEntry
+from app.ai.reflection import build_messages, TEMPERATURE
+from app.ai.metrics import span, async_httpx_event_hooks, TOOL
+
+
+async def _wait_for(awaitable, timeout: float):
+    """
+    `asyncio.wait_for` that never loses a cancellation.
+
+    Before Python 3.12, a cancel arriving just as `awaitable` completes is
+    swallowed and the result returned instead. Re-raise it (closing the
+    result, e.g. a freshly opened stream) so cancelled reflections stop.
+    """
+    result = await asyncio.wait_for(awaitable, timeout)
+    task = asyncio.current_task()
+    if task is not None and getattr(task, "cancelling", lambda: 0)():
+        close = getattr(result, "close", None)
+        if close is not None:
+            await close()
+        raise asyncio.CancelledError()
+    return result
+
+
+class ReflectionService:
+    """
+    Generate AI reflections asynchronously with pooled clients and streaming.
+
+    Attributes:
+        base_url (Optional[str]): Override for the API endpoint (e.g. a local mock).
+                                  `None` uses the OpenAI default / `OPENAI_BASE_URL`.
+        first_token_timeout (float): Seconds allowed until the first token arrives.
+        total_timeout (float): Seconds allowed for the whole reflection.
+        max_clients (int): Maximum number of pooled clients (one per API key).
+    """
+
+    def __init__(
+        self,
+        base_url: Optional[str] = None,
+        first_token_timeout: float = AI_FIRST_TOKEN_TIMEOUT,
+        total_timeout: float = AI_TOTAL_TIMEOUT,
+        max_clients: int = AI_MAX_CLIENTS,
+    ):
+        self.base_url = base_url
+        self.first_token_timeout = first_token_timeout
+        self.total_timeout = total_timeout
+        self.max_clients = max_clients
+        self._clients: "OrderedDict[str, AsyncOpenAI]" = OrderedDict()
+        self._in_use: Dict[AsyncOpenAI, int] = {}
+        self._retired: Set[AsyncOpenAI] = set()
+
+    async def get_client(self, api_key: str) -> AsyncOpenAI:
+        """
+        Return the pooled client for `api_key`, creating it on first use.
+
+        When the pool is full, the least recently used client is evicted. It is
+        closed right away if idle, otherwise when its last stream finishes.
+
+        Args:
+            api_key (str): OpenAI API key.
+
+        Returns:
+            AsyncOpenAI: A client bound to `api_key`.
+        """
+        client = self._clients.get(api_key)
+        if client is not None:
+            self._clients.move_to_end(api_key)
+            return client
+
+        client = AsyncOpenAI(
+            api_key=api_key,
+            base_url=self.base_url,
+            timeout=self.total_timeout,
+            http_client=DefaultAsyncHttpxClient(event_hooks=async_httpx_event_hooks()),
+        )
+        self._clients[api_key] = client
+        while len(self._clients) > self.max_clients:
+            _, evicted = self._clients.popitem(last=False)
+            if self._in_use.get(evicted):
+                self._retired.add(evicted)
+            else:
+                await evicted.close()
+        return client
+
+    @asynccontextmanager
+    async def _lease(self, api_key: str) -> AsyncIterator[AsyncOpenAI]:
+        """Hold the pooled client for `api_key` so eviction does not close it mid-stream."""
+        client = await self.get_client(api_key)
+        self._in_use[client] = self._in_use.get(client, 0) + 1
+        try:
+            yield client
+        finally:
+            self._in_use[client] -= 1
+            if not self._in_use[client]:
+                del self._in_use[client]
+                if client in self._retired:
+                    self._retired.discard(client)
+                    await client.close()
+
+    async def aclose(self) -> None:
+        """Close every pooled client, including evicted ones still in use."""
+        while self._clients:
+            _, client = self._clients.popitem()
+            await client.close()
+        while self._retired:
+            await self._retired.pop().close()
+
+    async def stream_reflection(
+        self, entry: JournalEntry, api_key: str, model: str = AI_MODEL
+    ) -> AsyncIterator[str]:
+        """
+        Stream a reflection for a journal entry.
+
+        Yields the reflection text accumulated so far after each streamed chunk,
+        which is what a Gradio textbox output expects. On failure or timeout the
+        last value yielded is a message prefixed with "[AI Error]".
+
+        Cancelling the consuming task raises `asyncio.CancelledError` here and
+        closes the HTTP stream.
+
+        Args:
+            entry (JournalEntry): The journal entry to reflect on.
+            api_key (str): OpenAI API key.
+            model (str, optional): Chat model. Defaults to `AI_MODEL`.
+
+        Yields:
+            str: The (stripped) reflection text received so far.
+        """
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        first_deadline = started + self.first_token_timeout
+        deadline = started + self.total_timeout
+        text = ""
+
+        try:
+            with span(TOOL, "reflection_stream", model=model, stream=True) as call:
+                if api_key in self._clients:
+                    call.cache_hit()
+                async with self._lease(api_key) as client:
+                    stream = await _wait_for(
+                        client.chat.completions.create(
+                            model=model,
+                            temperature=TEMPERATURE,
+                            messages=build_messages(entry),
+                            stream=True,
+                            stream_options={"include_usage": True},
+                        ),
+                        timeout=min(first_deadline, deadline) - loop.time(),
+                    )
+                    try:
+                        chunks = stream.__aiter__()
+                        while True:
+                            limit = deadline if text else min(first_deadline, deadline)
+                            try:
+                                chunk = await _wait_for(chunks.__anext__(), timeout=limit - loop.time())
+                            except StopAsyncIteration:
+                                break
+                            if chunk.usage:
+                                call.record_usage(chunk.usage)
+                            if not chunk.choices:
+                                continue
+                            delta = chunk.choices[0].delta.content
+                            if delta:
+                                text += delta
+                                yield text.strip()
+                    finally:
+                        await stream.close()
+        except asyncio.TimeoutError:
+            phase = "the first token" if not text else "the full reflection"
+            yield f"[AI Error] Timed out waiting for {phase}."
+        except Exception as e:
+            yield f"[AI Error] {str(e)}"
+
+    async def generate(self, entry: JournalEntry, api_key: str, model: str = AI_MODEL) -> str:
+        """
+        Generate a complete reflection without streaming it to a caller.
+
+        Args:
+            entry (JournalEntry): The journal entry to reflect on.
+            api_key (str): OpenAI API key.
+            model (str, optional): Chat model. Defaults to `AI_MODEL`.
+
+        Returns:
+            str: The formatted reflection, or a message prefixed with "[AI Error]".
+        """
+        text = ""
+        async for text in self.stream_reflection(entry, api_key, model):
+            pass
+        return text
@@ -0,0 +1,258 @@
+"""
+Incremental analytics for the CBT Journal app.
+
+`JournalAnalytics` keeps running aggregates over all journal entries:
+- Per-day and per-ISO-week buckets (entry count, intensity sum, 1–7 histogram).
+- Frequency of each cognitive distortion.
+- Distortion × primary-emotion co-occurrence counts.
+- Frequency of each emotion path (primary → secondary → tertiary).
+
+Aggregates are updated one entry at a time (see `app.storage.save_entry_jsonl`)
+and persisted as JSON next to the journal, so dashboard queries cost
+O(buckets) instead of reloading every entry.
+"""
+
+from collections import Counter
+from datetime import date, timedelta
+from typing import Dict, Iterable, List, Optional, Tuple
+from app.data_models.journal import JournalEntry
+
+#: Bump when the persisted layout changes; older files are rebuilt.
+ANALYTICS_VERSION = 1
+
+#: Emotion intensity scale used by the UI slider.
+INTENSITY_MIN, INTENSITY_MAX = 1, 7
+
+
+def _new_bucket() -> Dict:
+    return {"count": 0, "intensity_sum": 0, "histogram": [0] * (INTENSITY_MAX - INTENSITY_MIN + 1)}
+
+
+def emotion_path(entry: JournalEntry) -> str:
+    """
+    Format an entry's emotions as a path, e.g. "Fear → Anxiety → Worried".
+
+    Args:
+        entry (JournalEntry): The journal entry.
+
+    Returns:
+        str: The primary emotion followed by any secondary/tertiary emotions.
+    """
+    return " → ".join(e for e in (entry.emotion_primary, entry.emotion_secondary, entry.emotion_tertiary) if e)
+
+
+class JournalAnalytics:
+    """
+    Running aggregates over journal entries.
+
+    Attributes:
+        entries (int): Number of entries aggregated.
+        days (dict): Bucket per day ("YYYY-MM-DD").
+        weeks (dict): Bucket per ISO week ("YYYY-Www").
+        distortions (Counter): Entry count per cognitive distortion.
+        distortion_emotions (dict): Per distortion, a Counter of primary emotions.
+        emotion_paths (Counter): Entry count per emotion path.
+    """
+
+    def __init__(self):
+        self.entries = 0
+        self.days: Dict[str, Dict] = {}
+        self.weeks: Dict[str, Dict] = {}
+        self.distortions: Counter = Counter()
+        self.distortion_emotions: Dict[str, Counter] = {}
+        self.emotion_paths: Counter = Counter()
+
+    # ---------- Updates ----------
+    def add(self, entry: JournalEntry) -> None:
+        """
+        Fold one entry into the aggregates.
+
+        Entries whose date is not a valid YYYY-MM-DD are still counted for
+        distortions and emotions, but not in the day/week buckets.
+
+        Args:
+            entry (JournalEntry): The entry to add.
+        """
+        self.entries += 1
+        intensity = min(max(int(entry.emotion_intensity or INTENSITY_MIN), INTENSITY_MIN), INTENSITY_MAX)
+
+        try:
+            day = date.fromisoformat(str(entry.date).strip())
+        except ValueError:
+            day = None
+        if day is not None:
+            year, week, _ = day.isocalendar()
+            for buckets, key in ((self.days, day.isoformat()), (self.weeks, f"{year}-W{week:02d}")):
+                bucket = buckets.setdefault(key, _new_bucket())
+                bucket["count"] += 1
+                bucket["intensity_sum"] += intensity
+                bucket["histogram"][intensity - INTENSITY_MIN] += 1
+
+        distortion = entry.cbt_distortion or "Unspecified"
+        self.distortions[distortion] += 1
+        self.distortion_emotions.setdefault(distortion, Counter())[entry.emotion_primary] += 1
+        self.emotion_paths[emotion_path(entry)] += 1
+
+    @staticmethod
+    def from_entries(entries: Iterable[JournalEntry]) -> "JournalAnalytics":
+        """
+        Build aggregates from scratch (used when no persisted copy exists).
+
+        Args:
+            entries (Iterable[JournalEntry]): Entries to aggregate.
+
+        Returns:
+            JournalAnalytics: Aggregates over `entries`.
+        """
+        analytics = JournalAnalytics()
+        for entry in entries:
+            analytics.add(entry)
+        return analytics
+
+    def copy(self) -> "JournalAnalytics":
+        """
+        Independent copy of the aggregates.
+
+        Returns:
+            JournalAnalytics: A snapshot that later `add` calls on `self` do not change.
+        """
+        other = JournalAnalytics()
+        other.entries = self.entries
+        other.days = {k: {**b, "histogram": list(b["histogram"])} for k, b in self.days.items()}
+        other.weeks = {k: {**b, "histogram": list(b["histogram"])} for k, b in self.weeks.items()}
+        other.distortions = Counter(self.distortions)
+        other.distortion_emotions = {d: Counter(c) for d, c in self.distortion_emotions.items()}
+        other.emotion_paths = Counter(self.emotion_paths)
+        return other
+
+    # ---------- Queries ----------
+    def intensity_over_time(self, period: str = "day") -> List[Tuple[str, int, float]]:
+        """
+        Entry count and average intensity per time bucket.
+
+        Args:
+            period (str, optional): "day" or "week". Defaults to "day".
+
+        Returns:
+            List[Tuple[str, int, float]]: (bucket, count, average intensity), oldest first.
+        """
+        buckets = self.weeks if period == "week" else self.days
+        return [(key, b["count"], b["intensity_sum"] / b["count"]) for key, b in sorted(buckets.items())]
+
+    def intensity_histogram(self, period: str = "day") -> List[Tuple[str, List[int]]]:
+        """
+        Intensity histogram (counts for 1..7) per time bucket.
+
+        Args:
+            period (str, optional): "day" or "week". Defaults to "day".
+
+        Returns:
+            List[Tuple[str, List[int]]]: (bucket, histogram), oldest first.
+        """
+        buckets = self.weeks if period == "week" else self.days
+        return [(key, list(b["histogram"])) for key, b in sorted(buckets.items())]
+
+    def rolling_intensity(self, window_days: int = 7) -> List[Tuple[str, float]]:
+        """
+        Trailing average intensity over the last `window_days` calendar days.
+
+        Computed with a sliding window over the day buckets, so the cost is
+        proportional to the number of days with entries.
+
+        Args:
+            window_days (int, optional): Window length in days. Defaults to 7.
+
+        Returns:
+            List[Tuple[str, float]]: (day, rolling average) for each day with entries.
+        """
+        days = sorted(self.days.items())
+        result: List[Tuple[str, float]] = []
+        total = count = start = 0
+        for key, bucket in days:
+            today = date.fromisoformat(key)
+            total += bucket["intensity_sum"]
+            count += bucket["count"]
+            while date.fromisoformat(days[start][0]) <= today - timedelta(days=window_days):
+                total -= days[start][1]["intensity_sum"]
+                count -= days[start][1]["count"]
+                start += 1
+            result.append((key, total / count))
+        return result
+
+    def distortion_frequency(self) -> List[Tuple[str, int]]:
+        """
+        Number of entries per cognitive distortion.
+
+        Returns:
+            List[Tuple[str, int]]: (distortion, count), most frequent first.
+        """
+        return self.distortions.most_common()
+
+    def distortion_emotion_counts(self, distortion: Optional[str] = None) -> Dict[str, Dict[str, int]]:
+        """
+        Distortion × primary-emotion co-occurrence counts.
+
+        Args:
+            distortion (Optional[str], optional): Restrict to one distortion.
+
+        Returns:
+            Dict[str, Dict[str, int]]: {distortion: {emotion: count}}.
+        """
+        if distortion is not None:
+            return {distortion: dict(self.distortion_emotions.get(distortion, {}))}
+        return {d: dict(c) for d, c in self.distortion_emotions.items()}
+
+    def top_emotion_paths(self, n: int = 10) -> List[Tuple[str, int]]:
+        """
+        Most common emotion paths (primary → secondary → tertiary).
+
+        Args:
+            n (int, optional): Number of paths to return. Defaults to 10.
+
+        Returns:
+            List[Tuple[str, int]]: (emotion path, count), most common first.
+        """
+        return self.emotion_paths.most_common(n)
+
+    # ---------- Serialization ----------
+    def to_dict(self) -> dict:
+        """
+        Convert the aggregates into a dictionary.
+
+        Returns:
+            dict: JSON-serializable representation of the aggregates.
+        """
+        return {
+            "version": ANALYTICS_VERSION,
+            "entries": self.entries,
+            "days": self.days,
+            "weeks": self.weeks,
+            "distortions": dict(self.distortions),
+            "distortion_emotions": {d: dict(c) for d, c in self.distortion_emotions.items()},
+            "emotion_paths": dict(self.emotion_paths),
+        }
+
+    @staticmethod
+    def from_dict(data: dict) -> "JournalAnalytics":
+        """
+        Restore aggregates from a dictionary.
+
+        Args:
+            data (dict): Output of `to_dict`.
+
+        Returns:
+            JournalAnalytics: The restored aggregates.
+
+        Raises:
+            ValueError: If `data` was written by a different analytics version.
+        """
+        if data.get("version") != ANALYTICS_VERSION:
+            raise ValueError(f"Unsupported analytics version: {data.get('version')}")
+        analytics = JournalAnalytics()
+        analytics.entries = data["entries"]
+        analytics.days = data["days"]
+        analytics.weeks = data["weeks"]
+        analytics.distortions = Counter(data["distortions"])
+        analytics.distortion_emotions = {d: Counter(c) for d, c in data["distortion_emotions"].items()}
+        analytics.emotion_paths = Counter(data["emotion_paths"])
+        return analytics
@@ -0,0 +1,130 @@
+"""
+Configuration module for the CBT Journal app.
+
+This module defines global paths for data storage (JSONL, CSV, exports),
+per-user journal locations for hosted (multi-user) deployments, the
+Feeling Wheel reference file, AI reflection settings (model and timeout
+budget), and utility functions for ensuring directory existence and
+timestamp generation. It also lists the standard CSV field order used
+for exporting journal entries.
+
+Storage settings can be overridden with environment variables (or a
+`.env` file):
+- CBT_BASE_DIR: root folder (default `/content`, for Colab/Notebook).
+- CBT_DATA_DIR / CBT_EXPORT_DIR: data and export folders
+  (default `<base>/data` and `<base>/exports`).
+- CBT_MAX_OPEN_JOURNALS: journals kept open at once (default 64).
+- CBT_AI_MAX_STREAMS: AI reflections streamed at once across all users
+  (default 64).
+- CBT_AUTH: comma-separated `user:password` logins. When set, the app
+  requires login and each user gets their own journal.
+"""
+
+import hashlib
+import os
+from pathlib import Path
+from datetime import datetime
+from typing import Optional
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# === Base Directories ===
+BASE_DIR = Path(os.getenv("CBT_BASE_DIR", "/content"))  # Root project directory (default for Colab/Notebook)
+DATA_DIR = Path(os.getenv("CBT_DATA_DIR", BASE_DIR / "data"))  # Directory for storing user journal entries
+EXPORT_DIR = Path(os.getenv("CBT_EXPORT_DIR", BASE_DIR / "exports"))  # Directory for storing exported snapshots
+USERS_DIR = DATA_DIR / "users"  # Per-user journal shards (hosted deployments)
+
+# === File Paths ===
+FEELING_WHEEL_PATH = DATA_DIR / "Feeling_wheel.json"  # JSON file containing emotion hierarchy
+JSONL_PATH = DATA_DIR / "journal.jsonl"  # Log file where each entry is stored in JSON Lines format
+CSV_PATH   = DATA_DIR / "journal.csv"    # Flat CSV export of all journal entries
+BACKFILL_CHECKPOINT_PATH = DATA_DIR / "journal.backfill.jsonl"  # Reflections generated by an unfinished backfill
+
+# === Storage ===
+MAX_OPEN_JOURNALS = int(os.getenv("CBT_MAX_OPEN_JOURNALS", "64"))  # Bound on cached journal file handles
+ANALYTICS_SNAPSHOT_BYTES = 256 * 1024  # Journal growth between rewrites of the persisted analytics
+AUTH_USERS = [
+    (user.strip(), password.strip())
+    for user, sep, password in (pair.strip().partition(":") for pair in os.getenv("CBT_AUTH", "").split(","))
+    if sep and user.strip()
+]  # (username, password) logins; "user:pw, user2:pw2" is fine; empty means single-user mode
+
+# === AI Reflection ===
+AI_MODEL = "gpt-4o-mini"  # Default chat model for reflections
+AI_FIRST_TOKEN_TIMEOUT = 20.0  # Seconds to wait for the first streamed token
+AI_TOTAL_TIMEOUT = 90.0  # Overall budget (seconds) for one reflection
+AI_MAX_CLIENTS = 32  # Max pooled API clients (one per API key)
+AI_MAX_STREAMS = int(os.getenv("CBT_AI_MAX_STREAMS", "64"))  # Reflections streamed at once across all users
+BACKFILL_CONCURRENCY = 4  # Reflections generated in parallel by the backfill job
+BACKFILL_MAX_RETRIES = 3  # Extra attempts per entry before the backfill gives up on it
+
+def ensure_dirs():
+    """
+    Ensure that required directories exist.
+
+    Creates the `data/` and `exports/` directories if they do not
+    already exist. This is called at app startup to guarantee
+    paths are available for saving user files.
+    """
+    DATA_DIR.mkdir(parents=True, exist_ok=True)
+    EXPORT_DIR.mkdir(parents=True, exist_ok=True)
+
+def user_dir(user_id: str, root: Path = USERS_DIR) -> Path:
+    """
+    Folder holding one user's journal, analytics and backfill checkpoint.
+
+    Users are sharded by a hash of their id (`users/<2 hex>/<hash>/`), which
+    keeps directories small and keeps usernames out of file paths.
+
+    Args:
+        user_id (str): The user's id (e.g. the Gradio login username).
+        root (Path, optional): Folder to shard under. Defaults to `USERS_DIR`.
+
+    Returns:
+        Path: The user's folder (not created here).
+    """
+    digest = hashlib.sha256(user_id.encode("utf-8")).hexdigest()[:32]
+    return root / digest[:2] / digest
+
+def journal_path_for(user_id: Optional[str] = None) -> Path:
+    """
+    JSONL journal path for a user.
+
+    Args:
+        user_id (Optional[str]): The user's id; `None` means single-user mode.
+
+    Returns:
+        Path: `JSONL_PATH` in single-user mode, else the user's own journal.
+    """
+    return JSONL_PATH if not user_id else user_dir(user_id) / JSONL_PATH.name
+
+def export_dir_for(user_id: Optional[str] = None) -> Path:
+    """
+    Export folder for a user.
+
+    Args:
+        user_id (Optional[str]): The user's id; `None` means single-user mode.
+
+    Returns:
+        Path: `EXPORT_DIR` in single-user mode, else a per-user folder under it.
+    """
+    return EXPORT_DIR if not user_id else user_dir(user_id, EXPORT_DIR / "users")
+
+def ts() -> str:
+    """
+    Generate a timestamp string for filenames.
+
+    Returns:
+        str: Current datetime formatted as YYYYMMDD_HHMMSS.
+             Example: '20250825_154210'
+    """
+    return datetime.now().strftime("%Y%m%d_%H%M%S")
+
+# === CSV Schema ===
+CSV_FIELDS = [
+    "date", "event", "thought",
+    "emotion_primary", "emotion_secondary", "emotion_tertiary", "emotion_intensity",
+    "cbt_distortion", "reframing", "ai_reflection"
+]
+"""list[str]: Standard column order for exporting journal entries to CSV."""
@@ -0,0 +1,444 @@
+"""
+Storage utilities for the CBT Journal app.
+
+This module provides functions to:
+- Save journal entries in JSONL format (append-only log).
+- Keep the journal's analytics aggregates (`app.analytics`) up to date
+  and persisted next to the JSONL file. The journal itself is the change
+  log: the persisted snapshot records how much of it it covers (and a
+  digest of those bytes), and only entries appended after that are
+  replayed on load. Saves rewrite the
+  snapshot only every `ANALYTICS_SNAPSHOT_BYTES` of journal growth, so a
+  save costs the same however large the aggregates get.
+- Load (or stream) journal entries from the JSONL file.
+- Export all entries into a CSV file.
+- Create timestamped export snapshots.
+- Overwrite the JSONL file with a new list of entries.
+- Rewrite the JSONL file in one streaming pass (e.g. to fill in fields).
+
+Every journal (one per user in a hosted deployment, see
+`app.config.journal_path_for`) is safe to write from many Gradio worker
+threads and processes: writes hold a per-journal thread lock plus an
+exclusive `flock` on a `<journal>.lock` file (POSIX only; on Windows the
+thread lock alone covers the single-process app). Append handles, lock
+files and analytics are cached per journal in a bounded LRU
+(`MAX_OPEN_JOURNALS`), so busy users avoid reopening files on every save.
+
+All paths and field definitions are taken from `app.config`.
+"""
+
+import json, csv, hashlib, os, threading
+from collections import OrderedDict
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Callable, Iterator, List, Optional, Tuple
+from app.config import (
+    JSONL_PATH, CSV_PATH, EXPORT_DIR, MAX_OPEN_JOURNALS, ANALYTICS_SNAPSHOT_BYTES, ts, CSV_FIELDS,
+)
+from app.data_models.journal import JournalEntry
+from app.analytics import JournalAnalytics
+
+try:
+    import fcntl  # POSIX: serialize writers across worker processes
+except ImportError:  # Windows
+    fcntl = None
+
+class _Journal:
+    """Cached per-journal state: locks, append handle and analytics."""
+
+    def __init__(self, path: Path):
+        self.path = path
+        self.lock = threading.Lock()
+        self.lock_file = None
+        self.append_file = None
+        self.analytics: Optional[JournalAnalytics] = None
+        self.analytics_size = -1  # journal bytes folded into `analytics`
+        self.digest = hashlib.sha256()  # running digest of those bytes
+        self.seen = None  # journal (inode, size, mtime) when `analytics` was last brought up to date
+        self.snapshot_size = 0  # journal bytes covered by the persisted snapshot
+
+    def set_analytics(self, analytics: JournalAnalytics, digest, size: int, seen) -> None:
+        self.analytics, self.digest, self.analytics_size, self.seen = analytics, digest, size, seen
+
+    def append(self, line: str) -> int:
+        """Append one line through the cached handle; return the new journal size."""
+        if self.append_file is not None and self._replaced():
+            self.close_append()
+        data = line.encode("utf-8")
+        if self.append_file is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            # Unbuffered O_APPEND: each line is a single write() at end of file
+            self.append_file = open(self.path, "ab", buffering=0)
+            if not _ends_with_newline(self.path):
+                # Last line was written without one (e.g. by hand): keep it a separate entry
+                data = b"\n" + data
+        self.append_file.write(data)
+        return self.append_file.tell()
+
+    def _replaced(self) -> bool:
+        # Another process may have swapped the file in via os.replace
+        try:
+            return os.stat(self.path).st_ino != os.fstat(self.append_file.fileno()).st_ino
+        except FileNotFoundError:
+            return True
+
+    def close_append(self) -> None:
+        if self.append_file is not None:
+            self.append_file.close()
+            self.append_file = None
+
+    def close(self) -> None:
+        self.close_append()
+        if self.lock_file is not None:
+            self.lock_file.close()
+            self.lock_file = None
+        self.analytics = None
+
+def _ends_with_newline(path: Path) -> bool:
+    """True if `path` is empty or its last byte is a newline."""
+    with open(path, "rb") as f:
+        if f.seek(0, os.SEEK_END) == 0:
+            return True
+        f.seek(-1, os.SEEK_END)
+        return f.read(1) == b"\n"
+
+_journals: "OrderedDict[Path, _Journal]" = OrderedDict()
+_journals_lock = threading.Lock()
+
+def _journal(path: Path) -> _Journal:
+    """Return the cached state for `path`, evicting the least recently used."""
+    evicted = []
+    with _journals_lock:
+        journal = _journals.get(path)
+        if journal is None:
+            journal = _journals[path] = _Journal(path)
+            while len(_journals) > MAX_OPEN_JOURNALS:
+                evicted.append(_journals.popitem(last=False)[1])
+        else:
+            _journals.move_to_end(path)
+    for old in evicted:
+        with old.lock:
+            old.close()
+    return journal
+
+@contextmanager
+def _locked(path: Path) -> Iterator[_Journal]:
+    """Hold exclusive access to one journal (threads and, on POSIX, processes)."""
+    journal = _journal(path)
+    with journal.lock:
+        if fcntl is None:
+            yield journal
+            return
+        if journal.lock_file is None:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            journal.lock_file = open(path.with_name(path.name + ".lock"), "a")
+        fcntl.flock(journal.lock_file.fileno(), fcntl.LOCK_EX)
+        try:
+            yield journal
+        finally:
+            fcntl.flock(journal.lock_file.fileno(), fcntl.LOCK_UN)
+
+def close_journals() -> None:
+    """Close every cached journal handle (e.g. on shutdown or in benchmarks)."""
+    with _journals_lock:
+        journals = list(_journals.values())
+        _journals.clear()
+    for journal in journals:
+        with journal.lock:
+            journal.close()
+
+
+def save_entry_jsonl(entry: JournalEntry, path: Path = JSONL_PATH) -> None:
+    """
+    Append a journal entry to the JSONL file.
+
+    Creates the file (and its directory) on first use. The entry is written
+    before the analytics are updated, so a journal the analytics cannot read
+    (e.g. a malformed line) never blocks a save; the cached aggregates are
+    dropped instead and rebuilt by the next `load_analytics`.
+
+    Args:
+        entry (JournalEntry): The entry to save.
+        path (Path, optional): File path for JSONL storage.
+                               Defaults to `JSONL_PATH`.
+    """
+    line = json.dumps(entry.to_dict(), ensure_ascii=False) + "\n"
+    data = line.encode("utf-8")
+    with _locked(path) as journal:
+        # The cached aggregates can take the entry directly only if nothing touched the journal since
+        current = journal.analytics is not None and _identity(path) == journal.seen
+        size = journal.append(line)
+        try:
+            if current and size == journal.analytics_size + len(data):
+                journal.analytics.add(entry)
+                journal.digest.update(data)
+                journal.analytics_size, journal.seen = size, _identity(path)
+            else:  # not cached, or the journal changed since: catch up through this entry
+                _load_analytics_locked(journal)
+            if journal.analytics_size - journal.snapshot_size >= ANALYTICS_SNAPSHOT_BYTES:
+                _write_analytics_locked(journal)
+        except (OSError, ValueError, TypeError, KeyError):
+            journal.analytics = None
+
+def load_entries_jsonl(path: Path = JSONL_PATH) -> List[JournalEntry]:
+    """
+    Load all journal entries from the JSONL file.
+
+    Args:
+        path (Path, optional): File path for JSONL storage.
+                               Defaults to `JSONL_PATH`.
+
+    Returns:
+        List[JournalEntry]: A list of JournalEntry objects.
+                            Returns an empty list if the file does not exist.
+    """
+    return list(iter_entries_jsonl(path))
+
+def iter_entries_jsonl(path: Path = JSONL_PATH) -> Iterator[JournalEntry]:
+    """
+    Stream journal entries from the JSONL file one at a time.
+
+    Blank lines are skipped, so the n-th yielded entry is entry index n
+    (as used by `rewrite_entries_jsonl`). This reader takes no lock, so a
+    trailing line without a newline may be an append still in progress and
+    is not yielded.
+
+    Args:
+        path (Path, optional): File path for JSONL storage.
+                               Defaults to `JSONL_PATH`.
+
+    Yields:
+        JournalEntry: Each stored entry, in file order.
+                      Nothing is yielded if the file does not exist.
+    """
+    if not path.exists():
+        return
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            if not line.endswith("\n"):
+                break
+            if line.strip():
+                yield JournalEntry.from_dict(json.loads(line))
+
+def export_entries_csv(entries: List[JournalEntry], path: Path = CSV_PATH) -> None:
+    """
+    Export a list of journal entries to a CSV file.
+
+    Args:
+        entries (List[JournalEntry]): The entries to export.
+        path (Path, optional): Destination CSV path.
+                               Defaults to `CSV_PATH`.
+    """
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=CSV_FIELDS)
+        writer.writeheader()
+        for entry in entries:
+            writer.writerow(entry.to_dict())
+
+def export_snapshot(entries: List[JournalEntry], export_dir: Path = EXPORT_DIR):
+    """
+    Create a timestamped CSV snapshot of all entries.
+
+    Args:
+        entries (List[JournalEntry]): The entries to export.
+        export_dir (Path, optional): Destination folder (created if missing).
+                                     Defaults to `EXPORT_DIR`.
+
+    Returns:
+        Path: Path to the newly created CSV snapshot file.
+              Named as `journal_export_<timestamp>.csv`.
+    """
+    export_dir.mkdir(parents=True, exist_ok=True)
+    snapshot_path = export_dir / f"journal_export_{ts()}.csv"
+    export_entries_csv(entries, snapshot_path)
+    return snapshot_path
+
+def overwrite_jsonl(entries: List[JournalEntry], path: Path = JSONL_PATH) -> None:
+    """
+    Overwrite the JSONL file with a fresh list of entries.
+
+    Args:
+        entries (List[JournalEntry]): The entries to write.
+        path (Path, optional): File path for JSONL storage.
+                               Defaults to `JSONL_PATH`.
+    """
+    tmp_path = path.with_name(path.name + ".tmp")
+    analytics, digest = JournalAnalytics(), hashlib.sha256()
+    with _locked(path) as journal:
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            for entry in entries:
+                line = json.dumps(entry.to_dict(), ensure_ascii=False) + "\n"
+                f.write(line)
+                digest.update(line.encode("utf-8"))
+                analytics.add(entry)
+            size = f.tell()
+        # Replace rather than truncate, so other processes see a new file
+        journal.close_append()
+        os.replace(tmp_path, path)
+        journal.set_analytics(analytics, digest, size, _identity(path))
+        _write_analytics_locked(journal)
+
+def rewrite_entries_jsonl(
+    transform: Callable[[int, JournalEntry], JournalEntry], path: Path = JSONL_PATH
+) -> None:
+    """
+    Rewrite the JSONL file in a single streaming pass.
+
+    Each entry is passed through `transform(index, entry)` and written to a
+    temporary file, which then atomically replaces the original. Memory use
+    stays constant regardless of journal size.
+
+    The rewrite holds the journal lock, so no append can be in progress: a
+    last line without a newline is a complete entry and is rewritten like
+    the others.
+
+    Args:
+        transform (Callable[[int, JournalEntry], JournalEntry]): Returns the entry to write.
+        path (Path, optional): File path for JSONL storage.
+                               Defaults to `JSONL_PATH`.
+
+    Raises:
+        ValueError: If the last line is not valid JSON (e.g. torn by a crash).
+                    The journal is left untouched.
+    """
+    tmp_path = path.with_name(path.name + ".tmp")
+    analytics, digest = JournalAnalytics(), hashlib.sha256()
+    with _locked(path) as journal:
+        with open(path, "r", encoding="utf-8") as src, open(tmp_path, "w", encoding="utf-8") as f:
+            index = 0
+            for line in src:
+                if not line.strip():
+                    continue
+                try:
+                    entry = JournalEntry.from_dict(json.loads(line))
+                except json.JSONDecodeError:
+                    if line.endswith("\n"):
+                        raise
+                    f.close()
+                    os.remove(tmp_path)
+                    raise ValueError(f"{path} ends with an incomplete entry; repair it before rewriting")
+                entry = transform(index, entry)
+                line = json.dumps(entry.to_dict(), ensure_ascii=False) + "\n"
+                f.write(line)
+                digest.update(line.encode("utf-8"))
+                analytics.add(entry)
+                index += 1
+            size = f.tell()
+        journal.close_append()
+        os.replace(tmp_path, path)
+        journal.set_analytics(analytics, digest, size, _identity(path))
+        _write_analytics_locked(journal)
+
+def analytics_path(path: Path = JSONL_PATH) -> Path:
+    """
+    Location of the persisted analytics for a journal file.
+
+    Args:
+        path (Path, optional): File path for JSONL storage.
+                               Defaults to `JSONL_PATH`.
+
+    Returns:
+        Path: `<journal stem>.analytics.json` in the same directory.
+    """
+    return path.with_name(path.stem + ".analytics.json")
+
+def load_analytics(path: Path = JSONL_PATH) -> JournalAnalytics:
+    """
+    Return the analytics aggregates for a journal.
+
+    Served from memory or the persisted snapshot, plus any entries appended
+    since (by this or another process). Cached aggregates are reused as is
+    only while the journal's inode, size and mtime are what this process
+    last saw; otherwise the bytes they cover are re-hashed, and if those
+    changed (the journal was replaced, truncated or edited in place, e.g.
+    by hand) the aggregates are rebuilt from the journal once. The
+    persisted snapshot is checked against the journal the same way.
+
+    Args:
+        path (Path, optional): File path for JSONL storage.
+                               Defaults to `JSONL_PATH`.
+
+    Returns:
+        JournalAnalytics: A snapshot of the aggregates over all entries in the
+                          journal. Concurrent saves do not change it.
+    """
+    if not path.exists():
+        return JournalAnalytics()
+    with _locked(path) as journal:
+        return _load_analytics_locked(journal).copy()
+
+def _identity(path: Path) -> Optional[Tuple[int, int, int]]:
+    """(inode, size, mtime) of `path`, or None if it does not exist."""
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return stat.st_ino, stat.st_size, stat.st_mtime_ns
+
+def _load_analytics_locked(journal: _Journal) -> JournalAnalytics:
+    path = journal.path
+    seen = _identity(path)
+    if journal.analytics is not None and seen == journal.seen:
+        return journal.analytics
+    size = seen[1] if seen else 0
+    analytics, digest, start = journal.analytics, journal.digest, journal.analytics_size
+    if analytics is None or start > size or _prefix_digest(path, start).digest() != digest.digest():
+        analytics, digest, start = _read_snapshot(path, size)
+        journal.snapshot_size = start
+    if start < size:
+        start = _replay_tail(analytics, digest, path, start)
+    journal.set_analytics(analytics, digest, start, seen)
+    if seen is not None and start - journal.snapshot_size >= ANALYTICS_SNAPSHOT_BYTES:
+        _write_analytics_locked(journal)
+    return analytics
+
+def _prefix_digest(path: Path, length: int):
+    """Running SHA-256 of the first `length` bytes of `path` (of all of it, if shorter)."""
+    digest = hashlib.sha256()
+    if length > 0:
+        with open(path, "rb") as f:
+            while length > 0:
+                chunk = f.read(min(length, 1 << 20))
+                if not chunk:
+                    break
+                digest.update(chunk)
+                length -= len(chunk)
+    return digest
+
+def _read_snapshot(path: Path, size: int) -> tuple:
+    """Return the persisted aggregates, the digest and the journal offset they cover (empty and 0 if unusable)."""
+    try:
+        with open(analytics_path(path), "r", encoding="utf-8") as f:
+            data = json.load(f)
+        covered = data["journal_bytes"]
+        if covered <= size:
+            digest = _prefix_digest(path, covered)
+            if digest.hexdigest() == data["journal_digest"]:
+                return JournalAnalytics.from_dict(data), digest, covered
+    except (OSError, ValueError, KeyError, TypeError):
+        pass
+    return JournalAnalytics(), hashlib.sha256(), 0
+
+def _replay_tail(analytics: JournalAnalytics, digest, path: Path, start: int) -> int:
+    """Fold entries from byte `start` on into `analytics` and `digest`; return the offset after the last full line."""
+    with open(path, "rb") as f:
+        f.seek(start)
+        for line in f:
+            if not line.endswith(b"\n"):
+                break
+            if line.strip():
+                analytics.add(JournalEntry.from_dict(json.loads(line)))
+            digest.update(line)
+            start += len(line)
+    return start
+
+def _write_analytics_locked(journal: _Journal) -> None:
+    """Persist the cached aggregates with the journal offset and digest they cover."""
+    target = analytics_path(journal.path)
+    tmp_path = target.with_name(target.name + ".tmp")
+    snapshot = {"journal_bytes": journal.analytics_size, "journal_digest": journal.digest.hexdigest(),
+                **journal.analytics.to_dict()}
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        f.write(json.dumps(snapshot, ensure_ascii=False))
+    os.replace(tmp_path, target)
+    journal.snapshot_size = journal.analytics_size
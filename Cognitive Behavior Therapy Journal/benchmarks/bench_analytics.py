@@ -0,0 +1,117 @@
+"""
+Benchmark: incremental analytics vs. a full pandas recompute per dashboard view.
+
+Builds a temporary journal of synthetic entries spread over a year, then times
+- recompute: `load_entries_jsonl` + pandas (what a dashboard would do per view),
+- incremental: `load_analytics` + queries, both cold (from the persisted JSON)
+  and warm (in-memory), and
+- the extra cost `save_entry_jsonl` pays to keep the aggregates current.
+
+Usage (from the project folder):
+    python -m benchmarks.bench_analytics --entries 20000
+"""
+
+import argparse
+import json
+import random
+import tempfile
+import time
+from datetime import date, timedelta
+from pathlib import Path
+import pandas as pd
+from app import storage
+from app.data_models.journal import JournalEntry
+from app.distortions import get_distortion_names
+
+EMOTIONS = {
+    "Fear": ["Anxiety", "Insecurity"], "Sadness": ["Loneliness", "Grief"],
+    "Anger": ["Frustration", "Resentment"], "Joy": ["Serenity", "Optimism"],
+}
+
+
+def make_entry(rng: random.Random) -> JournalEntry:
+    primary = rng.choice(list(EMOTIONS))
+    return JournalEntry(
+        date=(date(2025, 1, 1) + timedelta(days=rng.randrange(365))).isoformat(),
+        event="Synthetic event", thought="Synthetic thought",
+        emotion_primary=primary,
+        emotion_secondary=rng.choice(EMOTIONS[primary] + [None]),
+        emotion_intensity=rng.randint(1, 7),
+        cbt_distortion=rng.choice(get_distortion_names()),
+        reframing="Synthetic reframe",
+    )
+
+
+def full_recompute(path: Path):
+    df = pd.DataFrame([e.to_dict() for e in storage.load_entries_jsonl(path)])
+    dates = pd.to_datetime(df["date"])
+    df["week"] = dates.dt.strftime("%G-W%V")
+    daily = df.groupby("date")["emotion_intensity"].agg(["count", "mean"])
+    daily["mean"].rolling(7, min_periods=1).mean()
+    df.groupby("week")["emotion_intensity"].agg(["count", "mean"])
+    df["cbt_distortion"].value_counts()
+    pd.crosstab(df["cbt_distortion"], df["emotion_primary"])
+    paths = df[["emotion_primary", "emotion_secondary", "emotion_tertiary"]].apply(
+        lambda row: " → ".join(e for e in row if isinstance(e, str) and e), axis=1
+    )
+    paths.value_counts().head(10)
+
+
+def incremental(path: Path):
+    analytics = storage.load_analytics(path)
+    analytics.intensity_over_time("day")
+    analytics.rolling_intensity(7)
+    analytics.intensity_over_time("week")
+    analytics.distortion_frequency()
+    analytics.distortion_emotion_counts()
+    analytics.top_emotion_paths(10)
+
+
+def timed(fn, repeat: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - start) / repeat
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--entries", type=int, default=20000)
+    parser.add_argument("--saves", type=int, default=200, help="Entries appended to time save overhead")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    rng = random.Random(0)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "journal.jsonl"
+        storage.overwrite_jsonl([make_entry(rng) for _ in range(args.entries)], path)
+
+        recompute = timed(lambda: full_recompute(path), args.repeat)
+
+        def cold():
+            storage.close_journals()
+            incremental(path)
+        cold_time = timed(cold, args.repeat)
+        warm_time = timed(lambda: incremental(path), args.repeat)
+
+        plain = Path(tmp) / "plain.jsonl"
+        extra = [make_entry(rng) for _ in range(args.saves)]
+
+        def append_only():
+            for entry in extra:
+                with open(plain, "a", encoding="utf-8") as f:
+                    f.write(json.dumps(entry.to_dict(), ensure_ascii=False) + "\n")
+        save_plain = timed(append_only, 1) / args.saves
+        save_with_analytics = timed(lambda: [storage.save_entry_jsonl(e, path) for e in extra], 1) / args.saves
+
+        days = len(storage.load_analytics(path).days)
+        print(f"{args.entries} entries, {days} day buckets")
+        print(f"full recompute     {recompute * 1000:9.2f} ms / view")
+        print(f"incremental cold   {cold_time * 1000:9.2f} ms / view  ({recompute / cold_time:6.1f}x faster)")
+        print(f"incremental warm   {warm_time * 1000:9.2f} ms / view  ({recompute / warm_time:6.1f}x faster)")
+        print(f"save (append only) {save_plain * 1000:9.3f} ms / entry")
+        print(f"save + analytics   {save_with_analytics * 1000:9.3f} ms / entry")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""
+Benchmark: AI reflection backfill throughput against a local mock endpoint.
+
+Builds a temporary journal of entries without reflections, then runs
+`backfill_reflections` at several concurrency levels and reports entries/s.
+A final run is interrupted halfway and resumed to check the checkpoint.
+
+Usage (from the project folder):
+    python -m benchmarks.bench_backfill --entries 200 --concurrency 1 4 16
+"""
+
+import argparse
+import asyncio
+import tempfile
+import time
+from pathlib import Path
+from app.ai.backfill import backfill_reflections
+from app.ai.reflection_service import ReflectionService
+from app.data_models.journal import JournalEntry
+from app.storage import overwrite_jsonl, iter_entries_jsonl
+from benchmarks.bench_reflection import ENTRY
+from benchmarks.mock_openai import MockOpenAIServer
+
+
+def make_journal(path: Path, n: int) -> None:
+    entries = [JournalEntry(**{**ENTRY.to_dict(), "event": f"{ENTRY.event} #{i}"}) for i in range(n)]
+    overwrite_jsonl(entries, path)
+
+
+async def run(base_url: str, path: Path, concurrency: int, limit=None):
+    service = ReflectionService(base_url=base_url)
+    try:
+        return await backfill_reflections(
+            "test", path, concurrency=concurrency, model="mock", limit=limit, service=service,
+        )
+    finally:
+        await service.aclose()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--entries", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 4, 16])
+    parser.add_argument("--first-token-delay", type=float, default=0.2)
+    parser.add_argument("--token-delay", type=float, default=0.002)
+    args = parser.parse_args()
+
+    with MockOpenAIServer(args.first_token_delay, args.token_delay) as server, \
+            tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "journal.jsonl"
+        for concurrency in args.concurrency:
+            make_journal(path, args.entries)
+            start = time.perf_counter()
+            stats = asyncio.run(run(server.base_url, path, concurrency))
+            elapsed = time.perf_counter() - start
+            filled = sum(1 for e in iter_entries_jsonl(path) if e.ai_reflection)
+            print(f"concurrency={concurrency:<3} {stats.written / elapsed:7.1f} entries/s  "
+                  f"({filled}/{args.entries} filled, {stats.failed} failed, {elapsed:5.2f} s)")
+
+        # Interrupt after half the entries, then resume from the checkpoint
+        make_journal(path, args.entries)
+        concurrency = max(args.concurrency)
+        requests_before = server.requests
+
+        async def interrupted():
+            task = asyncio.create_task(run(server.base_url, path, concurrency))
+            while server.requests - requests_before < args.entries // 2:
+                await asyncio.sleep(0.01)
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+
+        asyncio.run(interrupted())
+        first = server.requests - requests_before
+        stats = asyncio.run(run(server.base_url, path, concurrency))
+        filled = sum(1 for e in iter_entries_jsonl(path) if e.ai_reflection)
+        print(f"resume: {first} requests before interrupt, {stats.resumed} resumed, "
+              f"{stats.generated} generated after restart, {filled}/{args.entries} filled")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,133 @@
+"""
+Benchmark: blocking vs. streaming AI reflection, served by Gradio, against a local mock endpoint.
+
+Both paths are served by a real Gradio app with its queue and driven over
+HTTP by concurrent `gradio_client` users, so queueing and concurrency limits
+count exactly as in the deployed app:
+- legacy: the app's old reflection event, a sync handler that builds an
+  `OpenAI` client per click and blocks until the full reply, with Gradio's
+  default event concurrency (1);
+- app: the current `create_ui()` app, whose async handler streams through
+  `ReflectionService` with `concurrency_limit=AI_MAX_STREAMS`.
+
+Reports time-to-first-token as a user sees it: from submitting the event to
+the first reflection text arriving in the browser, queue wait included.
+
+Usage (from the project folder):
+    python -m benchmarks.bench_reflection --users 20 --rounds 3
+"""
+
+import argparse
+import os
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import List
+
+os.environ.setdefault("GRADIO_ANALYTICS_ENABLED", "False")
+os.environ.setdefault("CBT_BASE_DIR", str(Path(__file__).resolve().parents[1]))  # the bundled Feeling Wheel
+
+import gradio as gr
+from gradio_client import Client
+from openai import OpenAI
+from app.ai.reflection import build_messages, TEMPERATURE
+from app.config import AI_MAX_STREAMS
+from app.data_models.journal import JournalEntry
+from benchmarks.mock_openai import MockOpenAIServer
+
+ENTRY = JournalEntry(
+    date="2025-08-25",
+    event="My manager moved our 1:1 without saying why.",
+    thought="I must have done something wrong.",
+    emotion_primary="Fear",
+    emotion_secondary="Anxiety",
+    emotion_intensity=5,
+    cbt_distortion="Jumping to Conclusions",
+    reframing="Meetings move for many reasons.",
+)
+
+
+def legacy_app(base_url: str) -> gr.Blocks:
+    """The old reflection event: new client per click, blocking call, default concurrency."""
+    def generate_only_reflection(api_key):
+        client = OpenAI(api_key=api_key, base_url=base_url)
+        response = client.chat.completions.create(
+            model="mock", temperature=TEMPERATURE, messages=build_messages(ENTRY)
+        )
+        client.close()
+        return "✅ AI reflection generated.", response.choices[0].message.content
+
+    with gr.Blocks() as app:
+        api_key = gr.Textbox()
+        status, reflection = gr.Textbox(), gr.Textbox()
+        gr.Button().click(generate_only_reflection, inputs=[api_key], outputs=[status, reflection])
+    return app
+
+
+def current_app(base_url: str) -> gr.Blocks:
+    """The app as deployed; its pooled clients pick the mock up from OPENAI_BASE_URL."""
+    os.environ["OPENAI_BASE_URL"] = base_url
+    from app.interfaces.gradio_ui import create_ui
+    return create_ui()
+
+
+def run(app: gr.Blocks, args: list, users: int, rounds: int) -> List[float]:
+    """Serve `app`, submit `users` reflections at once per round; return each one's TTFT."""
+    app.queue()
+    app.launch(prevent_thread_lock=True, quiet=True)
+    try:
+        client = Client(app.local_url, verbose=False)
+        client.predict(*args, api_name="/generate_only_reflection")  # warm-up: imports, first connection
+
+        def one(_):
+            start = time.perf_counter()
+            job = client.submit(*args, api_name="/generate_only_reflection")
+            for status, text in job:  # streamed updates (generator handlers only)
+                if text:
+                    return time.perf_counter() - start
+            status, text = job.result()
+            if not text:
+                raise RuntimeError(f"no reflection text: {status}")
+            return time.perf_counter() - start
+
+        ttft = []
+        with ThreadPoolExecutor(max_workers=users) as pool:
+            for _ in range(rounds):
+                ttft.extend(pool.map(one, range(users)))
+        client.close()
+        return ttft
+    finally:
+        app.close()
+
+
+def _report(name, ttft, elapsed):
+    ttft = sorted(ttft)
+    p95 = ttft[int(0.95 * (len(ttft) - 1))]
+    print(f"{name:<8} ttft p50={statistics.median(ttft) * 1000:7.1f} ms  "
+          f"p95={p95 * 1000:7.1f} ms  wall={elapsed:5.2f} s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--users", type=int, default=20, help="Concurrent users per round")
+    parser.add_argument("--rounds", type=int, default=3)
+    parser.add_argument("--first-token-delay", type=float, default=0.3)
+    parser.add_argument("--token-delay", type=float, default=0.01)
+    args = parser.parse_args()
+
+    entry_args = [ENTRY.date, ENTRY.event, ENTRY.thought, ENTRY.emotion_primary, None, None,
+                  ENTRY.emotion_intensity, ENTRY.cbt_distortion, ENTRY.reframing, "test", True]
+    with MockOpenAIServer(args.first_token_delay, args.token_delay) as server:
+        start = time.perf_counter()
+        ttft = run(legacy_app(server.base_url), ["test"], args.users, args.rounds)
+        _report("legacy", ttft, time.perf_counter() - start)
+
+        start = time.perf_counter()
+        ttft = run(current_app(server.base_url), entry_args, args.users, args.rounds)
+        _report("app", ttft, time.perf_counter() - start)
+    print(f"(app reflection concurrency_limit={AI_MAX_STREAMS}; set CBT_AI_MAX_STREAMS to change it)")
+
+
+if __name__ == "__main__":
+    main()
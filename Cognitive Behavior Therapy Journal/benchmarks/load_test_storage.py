@@ -0,0 +1,107 @@
+"""
+Load test: many simulated users saving journal entries concurrently.
+
+Each worker process runs a thread pool (like Gradio workers) that calls
+`save_entry_jsonl` for interleaved users, in one of two layouts:
+- sharded: every user has their own journal (`app.config.user_dir`),
+- shared: everyone appends to one journal (the old single-file setup).
+
+Afterwards every journal is checked for torn or lost lines and for analytics
+that disagree with the entries. Append latency percentiles are reported.
+
+Usage (from the project folder):
+    python -m benchmarks.load_test_storage --users 200 --processes 4 --threads 16
+"""
+
+import argparse
+import json
+import statistics
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from pathlib import Path
+from typing import List
+from app import storage
+from app.config import user_dir, MAX_OPEN_JOURNALS
+from app.data_models.journal import JournalEntry
+from benchmarks.bench_reflection import ENTRY
+
+
+def journal_path(root: Path, layout: str, user: str) -> Path:
+    return root / "journal.jsonl" if layout == "shared" else user_dir(user, root / "users") / "journal.jsonl"
+
+
+def worker(root: Path, layout: str, users: List[str], entries_per_user: int, threads: int) -> List[float]:
+    """Save `entries_per_user` entries for each user; return per-save latencies (seconds)."""
+    def save(user: str, i: int) -> float:
+        entry = JournalEntry(**{**ENTRY.to_dict(), "event": f"{user} entry {i} " + "x" * 200})
+        start = time.perf_counter()
+        storage.save_entry_jsonl(entry, journal_path(root, layout, user))
+        return time.perf_counter() - start
+
+    jobs = [(user, i) for i in range(entries_per_user) for user in users]
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        latencies = list(pool.map(lambda job: save(*job), jobs))
+    storage.close_journals()
+    return latencies
+
+
+def verify(root: Path, layout: str, users: List[str], entries_per_user: int) -> str:
+    paths = {journal_path(root, layout, user) for user in users}
+    expected = len(users) * entries_per_user // len(paths)
+    problems = 0
+    for path in paths:
+        with open(path, "r", encoding="utf-8") as f:
+            lines = f.readlines()
+        for line in lines:
+            try:
+                json.loads(line)
+            except json.JSONDecodeError:
+                problems += 1
+        analytics = storage.load_analytics(path)
+        if len(lines) != expected or analytics.entries != expected:
+            problems += 1
+    return "OK" if not problems else f"{problems} PROBLEMS"
+
+
+def percentile(sorted_values: List[float], p: float) -> float:
+    return sorted_values[min(len(sorted_values) - 1, int(p / 100 * len(sorted_values)))]
+
+
+def run(layout: str, args) -> None:
+    users = [f"user{i:04d}" for i in range(args.users)]
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        start = time.perf_counter()
+        with ProcessPoolExecutor(max_workers=args.processes) as pool:
+            futures = [
+                pool.submit(worker, root, layout, users[i::args.processes], args.entries, args.threads)
+                for i in range(args.processes)
+            ]
+            latencies = sorted(x for f in futures for x in f.result())
+        elapsed = time.perf_counter() - start
+        status = verify(root, layout, users, args.entries)
+
+    ms = [x * 1000 for x in latencies]
+    print(f"{layout:<8} {len(ms)} saves in {elapsed:5.2f} s ({len(ms) / elapsed:7.0f}/s)  "
+          f"p50={statistics.median(ms):6.2f}  p90={percentile(ms, 90):6.2f}  p99={percentile(ms, 99):6.2f}  "
+          f"p99.9={percentile(ms, 99.9):6.2f}  max={ms[-1]:6.2f} ms  integrity={status}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--users", type=int, default=200)
+    parser.add_argument("--entries", type=int, default=20, help="Entries saved per user")
+    parser.add_argument("--processes", type=int, default=4)
+    parser.add_argument("--threads", type=int, default=16, help="Threads per process")
+    parser.add_argument("--layout", choices=["sharded", "shared", "both"], default="both")
+    args = parser.parse_args()
+
+    print(f"{args.users} users x {args.entries} entries, {args.processes} processes x {args.threads} threads, "
+          f"MAX_OPEN_JOURNALS={MAX_OPEN_JOURNALS} per process")
+    for layout in (["sharded", "shared"] if args.layout == "both" else [args.layout]):
+        run(layout, args)
+
+
+if __name__ == "__main__":
+    main()
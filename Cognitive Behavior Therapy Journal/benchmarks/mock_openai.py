@@ -0,0 +1,211 @@
+"""
+Local stand-in for the OpenAI Chat Completions endpoint.
+
+Serves `POST /v1/chat/completions` (streaming and non-streaming) with a
+configurable delay before the first token and between tokens, so the AI code
+paths can be benchmarked offline. Point a client at `server.base_url`.
+
+Replies honour `max_tokens` (the canned reply is repeated or cut to length)
+and `response_format={"type": "json_object"}`, and report usage with prompt
+tokens estimated at four characters per token.
+
+`ai_metrics.replay` at the repository root also uses this server. It drives
+the tools' own code, so it steers each call through the API key instead of
+the request: a key of the form
+
+    mock#<id> status=500 | reply=unsure | tokens=60
+
+scripts the successive requests made with it: the first gets HTTP 500, the
+second replies "unsure", and the third and any later ones reply with 60
+tokens. This is how replayed calls reproduce recorded retries, fallbacks and
+completion lengths.
+
+Usage:
+    with MockOpenAIServer(first_token_delay=0.3, token_delay=0.01) as server:
+        client = OpenAI(api_key="test", base_url=server.base_url)
+"""
+
+import json
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+#: Canned reply, split on spaces into streamed tokens.
+REPLY = (
+    "1) Warm Reflection\nIt makes sense that this felt heavy. "
+    "2) Distortion Deep-Dive\nThis thought jumps ahead of the evidence. "
+    "3) Emotion Check\nThe feeling may be protecting something you value. "
+    "4) Evidence Scan\n- Some support\n- Some challenge "
+    "5) Balanced Reframe Options\n1. It's possible that... 2. Another way... 3. A fairer take... "
+    "6) Tiny Next Step\nTake three slow breaths."
+)
+
+_SCRIPT_KEY = re.compile(r"Bearer mock#(\S+) (.*)")
+
+
+def script_key(script_id: str, steps) -> str:
+    """
+    Build an API key that scripts the mock's replies (see the module docstring).
+
+    Args:
+        script_id (str): Unique per scripted call; requests sharing it share the script.
+        steps: One dict per request, e.g. [{"status": 500}, {"tokens": 60}].
+
+    Returns:
+        str: The key to pass to the client.
+    """
+    return f"mock#{script_id} " + " | ".join(
+        " ".join(f"{key}={value}" for key, value in step.items()) for step in steps
+    )
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):  # keep benchmark output clean
+        pass
+
+    def do_POST(self):
+        try:
+            self._respond()
+        except (BrokenPipeError, ConnectionResetError):
+            pass  # client cancelled mid-stream
+
+    def _respond(self):
+        length = int(self.headers.get("Content-Length", 0))
+        body = json.loads(self.rfile.read(length) or b"{}")
+        server = self.server
+        step = {}
+        script = _SCRIPT_KEY.match(self.headers.get("Authorization", ""))
+        with server.lock:
+            server.requests += 1
+            fail = server.fail_every and server.requests % server.fail_every == 0
+            if script:
+                script_id, steps = script.group(1), script.group(2).split("|")
+                seen = server.scripts.get(script_id, 0)
+                server.scripts[script_id] = seen + 1
+                step = dict(pair.split("=", 1) for pair in steps[min(seen, len(steps) - 1)].split())
+        if fail or step.get("status", "200") != "200":
+            error = {"error": {"message": "mock failure", "type": "server_error"}}
+            self._send_json(int(step.get("status", 500)), error)
+            return
+
+        tokens = [t + " " for t in (step.get("reply") or REPLY).split(" ")]
+        max_tokens = int(step.get("tokens", 0)) or body.get("max_tokens") or body.get("max_completion_tokens")
+        if max_tokens:
+            tokens = (tokens * (max_tokens // len(tokens) + 1))[:max_tokens]
+        completion_tokens = len(tokens)
+        if (body.get("response_format") or {}).get("type") == "json_object":
+            tokens = ['{"text": ' + json.dumps("".join(tokens).strip()) + "}"]
+        prompt_tokens = _prompt_tokens(body.get("messages") or [])
+        model = body.get("model", "mock")
+        time.sleep(server.first_token_delay)
+
+        if body.get("stream"):
+            self.send_response(200)
+            self.send_header("Content-Type", "text/event-stream")
+            self.send_header("Transfer-Encoding", "chunked")
+            self.end_headers()
+            for i, token in enumerate(tokens):
+                if i:
+                    time.sleep(server.token_delay)
+                self._send_chunk(_chunk(model, {"content": token}))
+            final = _chunk(model, {}, finish_reason="stop")
+            if (body.get("stream_options") or {}).get("include_usage"):
+                self._send_chunk(final)
+                final = _chunk(model, None)
+                final["usage"] = _usage(prompt_tokens, completion_tokens)
+            self._send_chunk(final)
+            self._write_chunked(b"data: [DONE]\n\n")
+            self._write_chunked(b"")
+            return
+
+        time.sleep(server.token_delay * (completion_tokens - 1))
+        self._send_json(200, {
+            "id": "chatcmpl-mock",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": model,
+            "choices": [{
+                "index": 0,
+                "message": {"role": "assistant", "content": "".join(tokens).strip()},
+                "finish_reason": "stop",
+            }],
+            "usage": _usage(prompt_tokens, completion_tokens),
+        })
+
+    def _send_json(self, status, payload):
+        data = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _send_chunk(self, payload):
+        self._write_chunked(b"data: " + json.dumps(payload).encode("utf-8") + b"\n\n")
+
+    def _write_chunked(self, data):
+        self.wfile.write(f"{len(data):x}\r\n".encode("ascii") + data + b"\r\n")
+        self.wfile.flush()
+
+
+def _chunk(model, delta, finish_reason=None):
+    return {
+        "id": "chatcmpl-mock",
+        "object": "chat.completion.chunk",
+        "created": int(time.time()),
+        "model": model,
+        "choices": [] if delta is None else [{"index": 0, "delta": delta, "finish_reason": finish_reason}],
+    }
+
+
+def _prompt_tokens(messages):
+    return max(1, sum(len(str(m.get("content") or "")) for m in messages) // 4)
+
+
+def _usage(prompt_tokens, completion_tokens):
+    return {"prompt_tokens": prompt_tokens, "completion_tokens": completion_tokens,
+            "total_tokens": prompt_tokens + completion_tokens}
+
+
+class _Server(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 256  # the default backlog of 5 drops bursts of new connections
+
+
+class MockOpenAIServer:
+    """
+    Threaded mock server run in the background for the duration of a `with` block.
+
+    Attributes:
+        first_token_delay (float): Seconds before the first token (or whole body).
+        token_delay (float): Seconds between streamed tokens.
+        fail_every (int): If > 0, every Nth request returns HTTP 500.
+        base_url (str): URL to pass as `base_url` to an OpenAI client.
+    """
+
+    def __init__(self, first_token_delay: float = 0.3, token_delay: float = 0.01, fail_every: int = 0):
+        self._httpd = _Server(("127.0.0.1", 0), _Handler)
+        self._httpd.first_token_delay = first_token_delay
+        self._httpd.token_delay = token_delay
+        self._httpd.fail_every = fail_every
+        self._httpd.requests = 0
+        self._httpd.scripts = {}
+        self._httpd.lock = threading.Lock()
+        self.base_url = f"http://127.0.0.1:{self._httpd.server_address[1]}/v1"
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+
+    @property
+    def requests(self) -> int:
+        """Number of requests received so far."""
+        return self._httpd.requests
+
+    def __enter__(self) -> "MockOpenAIServer":
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self._httpd.shutdown()
+        self._httpd.server_close()
@@ -9,6 +9,26 @@ import os
 from PIL import Image
 from collections import Counter
 
+# ⏱️ Classification calls are timed when run from the portfolio repo with `ai_metrics`
+# on PYTHONPATH (AI_METRICS_TRACE=trace.jsonl writes a trace).
+try:
+    from ai_metrics import span, async_httpx_event_hooks
+except ImportError:  # the Hugging Face Space ships only this folder
+    from contextlib import nullcontext
+    from types import SimpleNamespace
+
+    _UNTIMED = SimpleNamespace(record_usage=lambda usage: None, fallback=lambda: None)
+
+    def span(tool, op, **labels):
+        return nullcontext(_UNTIMED)
+
+    def async_httpx_event_hooks():
+        return {}
+
+TOOL = "enneagram"
+# 🌐 Chat Completions endpoint root (override with OPENAI_BASE_URL, e.g. for a proxy or local mock)
+OPENAI_BASE_URL = os.getenv("OPENAI_BASE_URL", "https://api.openai.com/v1")
+
 # 🔢 Segment text into chunks
 def segment_text(text: str):
     if len(text) < 200:
@@ -31,33 +51,35 @@ def segment_text(text: str):
     return [chunk.strip() for chunk in chunks if chunk.strip()]
 
 # 🔁 Fallback to GPT-4 if fine-tuned model fails
-async def fallback_classify(client, api_key: str, chunk: str) -> str:
+async def fallback_classify(client, api_key: str, chunk: str, base_url: str = OPENAI_BASE_URL) -> str:
     try:
         fallback_prompt = (
             f"Analyze this text and determine which of the 9 Enneagram types (1-9) it most strongly reflects. "
             f"Respond only with the type number (e.g., '4' or '9'):\n\n{chunk}"
         )
-        response = await client.post(
-            "https://api.openai.com/v1/chat/completions",
-            headers={
-                "Authorization": f"Bearer {api_key}",
-                "Content-Type": "application/json"
-            },
-            json={
-                "model": "gpt-4",
-                "messages": [{"role": "user", "content": fallback_prompt}],
-                "temperature": 0.3
-            },
-            timeout=30
-        )
-        result = response.json()
-        prediction = result['choices'][0]['message']['content'].strip()
+        with span(TOOL, "fallback_classify", model="gpt-4") as call:
+            response = await client.post(
+                f"{base_url}/chat/completions",
+                headers={
+                    "Authorization": f"Bearer {api_key}",
+                    "Content-Type": "application/json"
+                },
+                json={
+                    "model": "gpt-4",
+                    "messages": [{"role": "user", "content": fallback_prompt}],
+                    "temperature": 0.3
+                },
+                timeout=30
+            )
+            result = response.json()
+            call.record_usage(result.get("usage"))
+            prediction = result['choices'][0]['message']['content'].strip()
         return prediction
     except Exception as e:
         return f"error: {str(e)}"
 
 # 🧠 Classify and explain
-async def classify_chunk_async(client, api_key: str, chunk: str) -> (str, str):
+async def classify_chunk_async(client, api_key: str, chunk: str, base_url: str = OPENAI_BASE_URL) -> (str, str):
     headers = {
         "Authorization": f"Bearer {api_key}",
         "Content-Type": "application/json"
@@ -70,17 +92,22 @@ async def classify_chunk_async(client, api_key: str, chunk: str) -> (str, str):
     }
 
     try:
-        classify_response = await client.post(
-            "https://api.openai.com/v1/chat/completions",
-            headers=headers,
-            json=classify_data,
-            timeout=30
-        )
-        classify_result = classify_response.json()
-        prediction = classify_result['choices'][0]['message']['content'].strip()
-
-        if not prediction.isdigit() or not (1 <= int(prediction) <= 9):
-            prediction = await fallback_classify(client, api_key, chunk)
+        with span(TOOL, "classify", model=classify_data["model"]) as call:
+            classify_response = await client.post(
+                f"{base_url}/chat/completions",
+                headers=headers,
+                json=classify_data,
+                timeout=30
+            )
+            classify_result = classify_response.json()
+            call.record_usage(classify_result.get("usage"))
+            prediction = classify_result['choices'][0]['message']['content'].strip()
+            needs_fallback = not prediction.isdigit() or not (1 <= int(prediction) <= 9)
+            if needs_fallback:
+                call.fallback()
+
+        if needs_fallback:
+            prediction = await fallback_classify(client, api_key, chunk, base_url)
 
         rationale_prompt = (
             f"Explain why the following text aligns with Enneagram {prediction}:\n\n{chunk}\n\n"
@@ -93,14 +120,16 @@ async def classify_chunk_async(client, api_key: str, chunk: str) -> (str, str):
             "temperature": 0.3
         }
 
-        rationale_response = await client.post(
-            "https://api.openai.com/v1/chat/completions",
-            headers=headers,
-            json=rationale_data,
-            timeout=30
-        )
-        rationale_result = rationale_response.json()
-        rationale = rationale_result['choices'][0]['message']['content'].strip()
+        with span(TOOL, "rationale", model=rationale_data["model"]) as call:
+            rationale_response = await client.post(
+                f"{base_url}/chat/completions",
+                headers=headers,
+                json=rationale_data,
+                timeout=30
+            )
+            rationale_result = rationale_response.json()
+            call.record_usage(rationale_result.get("usage"))
+            rationale = rationale_result['choices'][0]['message']['content'].strip()
 
         return prediction, rationale
 
@@ -108,7 +137,7 @@ async def classify_chunk_async(client, api_key: str, chunk: str) -> (str, str):
         return f"error: {str(e)}", "error"
 
 # 📋 Generate summary
-async def generate_summary(client, api_key: str, counter: Counter) -> str:
+async def generate_summary(client, api_key: str, counter: Counter, base_url: str = OPENAI_BASE_URL) -> str:
     try:
         type_counts = "\n".join(f"{k}: {v} chunks" for k, v in counter.items())
 
@@ -119,21 +148,23 @@ async def generate_summary(client, api_key: str, counter: Counter) -> str:
             "Then, based on the 2-3 least represented of the nine total types, suggest small edits or adjustments to help reach those individuals without altering the theological or Gospel-driven core of the message. Remember to incorporate the two important elements of homiletics law and gospel or problem in the text / world and grace in the text / world. this might relate to enneagram strengths and weaknesses."
         )
 
-        response = await client.post(
-            "https://api.openai.com/v1/chat/completions",
-            headers={
-                "Authorization": f"Bearer {api_key}",
-                "Content-Type": "application/json"
-            },
-            json={
-                "model": "gpt-4",
-                "messages": [{"role": "user", "content": summary_prompt}],
-                "temperature": 0.5
-            },
-            timeout=60
-        )
-        result = response.json()
-        summary_text = result['choices'][0]['message']['content'].strip()
+        with span(TOOL, "summary", model="gpt-4") as call:
+            response = await client.post(
+                f"{base_url}/chat/completions",
+                headers={
+                    "Authorization": f"Bearer {api_key}",
+                    "Content-Type": "application/json"
+                },
+                json={
+                    "model": "gpt-4",
+                    "messages": [{"role": "user", "content": summary_prompt}],
+                    "temperature": 0.5
+                },
+                timeout=60
+            )
+            result = response.json()
+            call.record_usage(result.get("usage"))
+            summary_text = result['choices'][0]['message']['content'].strip()
 
         return summary_text
     except Exception as e:
@@ -141,7 +172,7 @@ async def generate_summary(client, api_key: str, counter: Counter) -> str:
 
 # 🧪 Process all chunks
 async def process_all_chunks(api_key: str, chunks):
-    async with httpx.AsyncClient() as client:
+    async with httpx.AsyncClient(event_hooks=async_httpx_event_hooks()) as client:
         tasks = [classify_chunk_async(client, api_key, chunk) for chunk in chunks]
         results = await asyncio.gather(*tasks)
     return results
@@ -199,7 +230,7 @@ def analyze_text(user_api_key, text_input):
 
 # 🏃‍♂️ Separate runner because analyze_text can't be async directly
 async def run_summary(api_key, counter):
-    async with httpx.AsyncClient() as client:
+    async with httpx.AsyncClient(event_hooks=async_httpx_event_hooks()) as client:
         return await generate_summary(client, api_key, counter)
 
 # 🖥️ Gradio Interface
@@ -224,4 +255,6 @@ def create_interface():
 
 # 🚀 Launch
 demo = create_interface()
-demo.launch()
+
+if __name__ == "__main__":
+    demo.launch()
@@ -0,0 +1,31 @@
+"""
+Shared latency and cost instrumentation for the portfolio's OpenAI-backed tools.
+
+Each tool wraps its AI calls in `span(...)`; see `ai_metrics.recorder`.
+`ai_metrics.report` summarises traces and `ai_metrics.replay` replays them
+against a local mock server to catch hot-path regressions.
+"""
+
+from ai_metrics.recorder import (
+    Call,
+    Histogram,
+    async_httpx_event_hooks,
+    current_call,
+    httpx_event_hooks,
+    reset,
+    set_trace_path,
+    snapshot,
+    span,
+)
+
+__all__ = [
+    "Call",
+    "Histogram",
+    "async_httpx_event_hooks",
+    "current_call",
+    "httpx_event_hooks",
+    "reset",
+    "set_trace_path",
+    "snapshot",
+    "span",
+]
@@ -0,0 +1,346 @@
+"""
+Per-call recording of OpenAI requests: spans, histograms and the JSONL trace.
+
+A *span* wraps one logical AI call (e.g. "classify one chunk"):
+
+    with span("enneagram", "classify", model="gpt-4") as call:
+        response = await client.post(...)
+        call.record_usage(response.json().get("usage"))
+
+On exit it records wall time, time-to-first-byte, token usage, retries,
+fallbacks, cache hits and the exception type (if any) into in-process
+histograms (see `snapshot`) and, when `AI_METRICS_TRACE` names a file, one
+JSON line per call. Prompts and completions are never recorded.
+
+Time-to-first-byte and transport-level retries are captured by httpx event
+hooks (`httpx_event_hooks` / `async_httpx_event_hooks`) installed on the
+HTTP client that the span's request goes through.
+"""
+
+import contextvars
+import json
+import math
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, Optional, Tuple
+
+#: Histogram resolution: 8 buckets per doubling (~9% wide), from 0.1 ms.
+_BUCKETS_PER_DOUBLING = 8
+_MIN_MS = 0.1
+
+
+class Histogram:
+    """
+    Log-bucketed latency histogram with O(1) inserts and small memory.
+
+    Attributes:
+        count (int): Number of samples.
+        total (float): Sum of samples.
+        min (float): Smallest sample.
+        max (float): Largest sample.
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.min = math.inf
+        self.max = 0.0
+        self._buckets: Dict[int, int] = {}
+
+    def add(self, value: float) -> None:
+        """Record one sample (e.g. milliseconds)."""
+        self.count += 1
+        self.total += value
+        self.min = min(self.min, value)
+        self.max = max(self.max, value)
+        index = int(math.log2(max(value, _MIN_MS) / _MIN_MS) * _BUCKETS_PER_DOUBLING)
+        self._buckets[index] = self._buckets.get(index, 0) + 1
+
+    def percentile(self, p: float) -> Optional[float]:
+        """
+        Estimate the p-th percentile (0–100).
+
+        Returns:
+            Optional[float]: The bucket's geometric midpoint, clamped to the
+                             observed min/max; None when empty.
+        """
+        if not self.count:
+            return None
+        rank = p / 100 * self.count
+        seen = 0
+        for index in sorted(self._buckets):
+            seen += self._buckets[index]
+            if seen >= rank:
+                mid = _MIN_MS * 2 ** ((index + 0.5) / _BUCKETS_PER_DOUBLING)
+                return min(max(mid, self.min), self.max)
+        return self.max
+
+    def mean(self) -> Optional[float]:
+        return self.total / self.count if self.count else None
+
+
+class Stats:
+    """Aggregates for one (tool, op) pair."""
+
+    def __init__(self):
+        self.calls = 0
+        self.errors = 0
+        self.retries = 0
+        self.fallbacks = 0
+        self.cache_hits = 0
+        self.prompt_tokens = 0
+        self.completion_tokens = 0
+        self.cached_tokens = 0
+        self.wall_ms = Histogram()
+        self.ttfb_ms = Histogram()
+
+    def add(self, record: Dict[str, Any]) -> None:
+        """Fold one trace record (as written by `Call.to_record`) into the stats."""
+        self.calls += 1
+        self.errors += bool(record.get("error"))
+        self.retries += record.get("retries") or 0
+        self.fallbacks += bool(record.get("fallback"))
+        self.cache_hits += bool(record.get("cache_hit"))
+        self.prompt_tokens += record.get("prompt_tokens") or 0
+        self.completion_tokens += record.get("completion_tokens") or 0
+        self.cached_tokens += record.get("cached_tokens") or 0
+        self.wall_ms.add(record["wall_ms"])
+        if record.get("ttfb_ms") is not None:
+            self.ttfb_ms.add(record["ttfb_ms"])
+
+    def summary(self) -> Dict[str, Any]:
+        """Return a flat, JSON-friendly summary (rates are per call)."""
+        calls = self.calls or 1
+        return {
+            "calls": self.calls,
+            "error_rate": self.errors / calls,
+            "retries_per_call": self.retries / calls,
+            "fallback_rate": self.fallbacks / calls,
+            "cache_hit_rate": self.cache_hits / calls,
+            "prompt_tokens_avg": self.prompt_tokens / calls,
+            "completion_tokens_avg": self.completion_tokens / calls,
+            "cached_tokens_avg": self.cached_tokens / calls,
+            "wall_ms_p50": self.wall_ms.percentile(50),
+            "wall_ms_p95": self.wall_ms.percentile(95),
+            "wall_ms_p99": self.wall_ms.percentile(99),
+            "ttfb_ms_p50": self.ttfb_ms.percentile(50),
+            "ttfb_ms_p95": self.ttfb_ms.percentile(95),
+        }
+
+
+class Call:
+    """
+    State of one in-flight AI call, yielded by `span`.
+
+    Attributes:
+        tool (str): Which app made the call (e.g. "cbt_journal").
+        op (str): Operation within the tool (e.g. "reflection_stream").
+        labels (dict): Extra labels such as model or stream mode.
+        parent (Optional[str]): Op of the enclosing span, if this call is part of
+                                a larger one (e.g. a reflection inside "backfill_entry").
+    """
+
+    def __init__(self, tool: str, op: str, labels: Dict[str, Any], parent: Optional[str] = None):
+        self.tool = tool
+        self.op = op
+        self.labels = labels
+        self.parent = parent
+        self.started_at = time.time()
+        self._start = time.perf_counter()
+        self._first_byte: Optional[float] = None
+        self._requests = 0
+        self._retries = 0
+        self._fallback = False
+        self._cache_hit = False
+        self._usage: Dict[str, int] = {}
+        self._error: Optional[str] = None
+
+    def first_byte(self) -> None:
+        """Mark the first response byte (only the first mark counts)."""
+        if self._first_byte is None:
+            self._first_byte = time.perf_counter()
+
+    def request_sent(self) -> None:
+        """
+        Count one HTTP request; every request after the first is a retry.
+
+        A retried request restarts the wait, so time-to-first-byte is measured
+        to the response that was actually used, not a failed attempt's.
+        """
+        self._requests += 1
+        self._first_byte = None
+
+    def retry(self) -> None:
+        """Count an application-level retry."""
+        self._retries += 1
+
+    def fallback(self) -> None:
+        """Mark that the call had to fall back (e.g. to another model)."""
+        self._fallback = True
+
+    def cache_hit(self) -> None:
+        """Mark that the call was served from, or reused, a cache."""
+        self._cache_hit = True
+
+    def fail(self, reason: str) -> None:
+        """Record an error the caller handles itself instead of raising."""
+        self._error = reason
+
+    def record_usage(self, usage: Any) -> None:
+        """
+        Record token usage from an OpenAI response.
+
+        Args:
+            usage: `response.usage` from the SDK, or the "usage" dict of a raw
+                   JSON response. None is ignored.
+        """
+        if usage is None:
+            return
+        get = usage.get if isinstance(usage, dict) else lambda key: getattr(usage, key, None)
+        details = get("prompt_tokens_details")
+        cached = (details.get("cached_tokens") if isinstance(details, dict)
+                  else getattr(details, "cached_tokens", None))
+        self._usage = {
+            "prompt_tokens": get("prompt_tokens") or 0,
+            "completion_tokens": get("completion_tokens") or 0,
+            "cached_tokens": cached or 0,
+        }
+
+    def to_record(self, end: float) -> Dict[str, Any]:
+        """Build the trace record for this call, finished at perf_counter() time `end`."""
+        return {
+            "ts": round(self.started_at, 3),
+            "tool": self.tool,
+            "op": self.op,
+            "parent": self.parent,
+            **self.labels,
+            "wall_ms": round((end - self._start) * 1000, 3),
+            "ttfb_ms": None if self._first_byte is None else round((self._first_byte - self._start) * 1000, 3),
+            **self._usage,
+            "retries": self._retries + max(0, self._requests - 1),
+            "fallback": self._fallback,
+            "cache_hit": self._cache_hit,
+            "error": self._error,
+        }
+
+
+_current: contextvars.ContextVar[Optional[Call]] = contextvars.ContextVar("ai_metrics_call", default=None)
+_stats: Dict[Tuple[str, str], Stats] = {}
+_lock = threading.Lock()
+_trace_path: Optional[str] = os.getenv("AI_METRICS_TRACE") or None
+_trace_file = None
+
+
+def set_trace_path(path: Optional[str]) -> None:
+    """
+    Start (or, with None, stop) writing call records to a JSONL trace file.
+
+    Defaults to the `AI_METRICS_TRACE` environment variable.
+    """
+    global _trace_path, _trace_file
+    with _lock:
+        if _trace_file is not None:
+            _trace_file.close()
+        _trace_path, _trace_file = path, None
+
+
+def current_call() -> Optional[Call]:
+    """Return the innermost active span's call in this context, if any."""
+    return _current.get()
+
+
+@contextmanager
+def span(tool: str, op: str, **labels: Any) -> Iterator[Call]:
+    """
+    Measure one AI call.
+
+    Exceptions propagate unchanged; their type name is recorded as the error.
+
+    Args:
+        tool (str): Tool name, e.g. "cc_objectives", "enneagram", "cbt_journal".
+        op (str): Operation name within the tool.
+        **labels: Extra record fields (keep them small, e.g. model="gpt-4").
+
+    Yields:
+        Call: Mark first byte, usage, retries, fallbacks and cache hits on it.
+    """
+    outer = _current.get()
+    call = Call(tool, op, labels, parent=outer.op if outer is not None else None)
+    token = _current.set(call)
+    try:
+        yield call
+    except BaseException as e:
+        call._error = call._error or type(e).__name__
+        raise
+    finally:
+        end = time.perf_counter()
+        try:
+            _current.reset(token)
+        except ValueError:  # generator finalized in another context
+            pass
+        _record(call.to_record(end))
+
+
+def _record(record: Dict[str, Any]) -> None:
+    global _trace_file
+    with _lock:
+        key = (record["tool"], record["op"])
+        _stats.setdefault(key, Stats()).add(record)
+        if _trace_path:
+            if _trace_file is None:
+                _trace_file = open(_trace_path, "a", encoding="utf-8", buffering=1)
+            _trace_file.write(json.dumps(record) + "\n")
+
+
+def snapshot() -> Dict[str, Dict[str, Any]]:
+    """
+    Summaries of all calls recorded in this process so far.
+
+    Returns:
+        Dict[str, Dict[str, Any]]: `Stats.summary()` keyed by "tool/op".
+    """
+    with _lock:
+        return {f"{tool}/{op}": stats.summary() for (tool, op), stats in sorted(_stats.items())}
+
+
+def reset() -> None:
+    """Clear the in-process histograms (the trace file is untouched)."""
+    with _lock:
+        _stats.clear()
+
+
+def _on_request(request) -> None:
+    call = _current.get()
+    if call is not None:
+        call.request_sent()
+
+
+def _on_response(response) -> None:
+    call = _current.get()
+    if call is not None:
+        call.first_byte()
+
+
+async def _on_request_async(request) -> None:
+    _on_request(request)
+
+
+async def _on_response_async(response) -> None:
+    _on_response(response)
+
+
+def httpx_event_hooks() -> Dict[str, list]:
+    """
+    Event hooks for a sync `httpx.Client` (or `openai.DefaultHttpxClient`).
+
+    They count requests (so SDK-level retries are recorded) and mark the
+    first byte when response headers arrive, for the active span.
+    """
+    return {"request": [_on_request], "response": [_on_response]}
+
+
+def async_httpx_event_hooks() -> Dict[str, list]:
+    """Event hooks for an `httpx.AsyncClient` (or `openai.DefaultAsyncHttpxClient`)."""
+    return {"request": [_on_request_async], "response": [_on_response_async]}
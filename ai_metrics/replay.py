@@ -0,0 +1,335 @@
+"""
+Replay a recorded AI workload through the tools' own code against a local mock.
+
+Each trace record is replayed at its recorded start offset (scaled by
+`--speed`) by calling the function that made it, pointed at a local mock
+OpenAI server:
+
+- cbt_journal: `generate_reflection`, `ReflectionService.stream_reflection`
+  and `backfill_reflections`
+- enneagram: `classify_chunk_async` and `generate_summary`
+- cc_objectives: `planner.generate_plan`
+
+Because the mock's latency is fixed, changes in the replayed numbers come from
+the tools' client-side hot path (client setup, connection handling, streaming,
+parsing, retry and fallback logic) rather than from the network or the model.
+Compare replays with `--baseline`.
+
+Each call's API key scripts the mock (see the CBT Journal's
+`benchmarks/mock_openai.py`), so recorded retries (HTTP 500s), Enneagram
+fallbacks (a non-numeric classification), errors and completion lengths are
+reproduced by the tools themselves. A CBT reflection recorded as a cache hit
+has its client pooled before the call. Prompts are never stored in traces, so
+the tools' free-text inputs are filler sized to the recorded prompt.
+
+Calls made as part of another recorded call (Enneagram fallbacks and
+rationales, reflections inside a backfill) are issued by that call's replay,
+not on their own. Records of a tool whose code cannot be imported (e.g. its
+UI library is not installed) are skipped with a warning.
+
+A call that raises although its record has no error is a replay failure:
+each one is reported and the exit status is non-zero, so a broken driver
+cannot pass for a faster tool.
+
+Without a trace, `--synthetic` generates a workload shaped like the three
+tools.
+
+Usage (from the repository root):
+    AI_METRICS_TRACE=trace.jsonl PYTHONPATH=. python "Personality Type Classification (Enneagram)/app (1).py"
+    python -m ai_metrics.replay trace.jsonl --out replay.jsonl
+    python -m ai_metrics.replay --synthetic --out base.jsonl
+    python -m ai_metrics.replay --synthetic --out new.jsonl --baseline base.jsonl
+"""
+
+import argparse
+import asyncio
+import importlib.util
+import os
+import random
+import statistics
+import sys
+import tempfile
+from collections import Counter
+from dataclasses import replace
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+from openai import DEFAULT_MAX_RETRIES
+from ai_metrics import recorder
+from ai_metrics.report import (
+    MIN_CALLS, load_trace, print_skipped, print_table, regressions, summarize, undersampled,
+)
+
+ROOT = Path(__file__).resolve().parents[1]
+CBT_PROJECT = ROOT / "Cognitive Behavior Therapy Journal"
+ENNEAGRAM_APP = ROOT / "Personality Type Classification (Enneagram)" / "app (1).py"
+CC_PLANNER = ROOT / "CC Objective and Blooms Generator" / "planner.py"
+
+# The CBT Journal is replayed through its `app` package, and its benchmarks own
+# the mock server (they must keep running from that project folder alone).
+sys.path.insert(0, str(CBT_PROJECT))
+
+from benchmarks.mock_openai import MockOpenAIServer, script_key  # noqa: E402
+
+#: Ops issued by another op's code (`classify_chunk_async`), not replayed on their own.
+DERIVED = {("enneagram", "fallback_classify"), ("enneagram", "rationale")}
+
+#: Replays one record, given the record and a unique script id.
+Driver = Callable[[Dict[str, Any], str], Awaitable[Any]]
+Cleanup = List[Callable[[], Awaitable[Any]]]
+
+
+def synthetic_workload(sessions: int = 20, seed: int = 0) -> List[Dict[str, Any]]:
+    """
+    Build trace-shaped records for a mix of tool sessions, 0.5 s apart.
+
+    Args:
+        sessions (int): Sessions per tool.
+        seed (int): Random seed, so runs are comparable.
+
+    Returns:
+        List[Dict[str, Any]]: Records with ts, tool, op, model, stream, token
+                              counts and retry / fallback / cache-hit fields.
+    """
+    rng = random.Random(seed)
+    records = []
+
+    def add(ts, tool, op, model, prompt, completion, stream=False, **fields):
+        records.append({"ts": ts, "tool": tool, "op": op, "parent": None, "model": model, "stream": stream,
+                        "prompt_tokens": prompt, "completion_tokens": completion,
+                        "retries": 0, "fallback": False, "cache_hit": False, "error": None, **fields})
+
+    for i in range(sessions):
+        ts = i * 0.5
+        # Most reflections come from a returning user whose client is still pooled
+        add(ts, "cbt_journal", "reflection_stream", "gpt-4o-mini", rng.randint(500, 800), 350, stream=True,
+            cache_hit=rng.random() < 0.7, retries=int(rng.random() < 0.05))
+        add(ts, "cc_objectives", "generate_plan", "gpt-4o-mini", rng.randint(650, 800), 900,
+            retries=int(rng.random() < 0.05))
+        # Chunks are classified concurrently; each runs classify -> (fallback) -> rationale
+        for chunk in range(rng.randint(5, 15)):
+            fallback = rng.random() < 0.1
+            add(ts, "enneagram", "classify", "ft:gpt-3.5-turbo", 300, 1, fallback=fallback)
+            step = ts + 0.1
+            if fallback:
+                add(step, "enneagram", "fallback_classify", "gpt-4", 340, 1)
+                step += 0.1
+            add(step, "enneagram", "rationale", "gpt-4", 360, 60)
+        add(ts + 1, "enneagram", "summary", "gpt-4", 170, 300)
+    return records
+
+
+def _filler(chars: int) -> str:
+    """Stand-in for user text, which traces never contain."""
+    return ("I keep thinking about what happened today. " * (chars // 43 + 1))[:max(chars, 0)]
+
+
+def _script(record: Dict[str, Any], reply: Dict[str, Any], failures: Optional[int] = None) -> List[Dict[str, Any]]:
+    """Mock steps for one call: `failures` HTTP 500s (default: its retries), then `reply`."""
+    if record.get("error"):
+        return [{"status": 500}]  # every attempt fails
+    if failures is None:
+        failures = record.get("retries") or 0
+    return [{"status": 500}] * failures + [reply]
+
+
+def _completion(record: Dict[str, Any]) -> Dict[str, Any]:
+    return {"tokens": record.get("completion_tokens") or 1}
+
+
+def _load(name: str, path: Path):
+    """Import a tool script that is not an importable module."""
+    spec = importlib.util.spec_from_file_location(name, path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def _cbt_drivers(base_url: str, cleanup: Cleanup) -> Dict[str, Driver]:
+    from app.ai import reflection
+    from app.ai.backfill import backfill_reflections
+    from app.ai.reflection_service import ReflectionService
+    from app.config import BACKFILL_MAX_RETRIES
+    from app.data_models.journal import JournalEntry
+    from app.storage import overwrite_jsonl
+
+    os.environ["OPENAI_BASE_URL"] = base_url  # generate_reflection's pooled sync clients
+    service = ReflectionService(base_url=base_url)
+    cleanup.append(service.aclose)
+    blank = JournalEntry(
+        date="2024-01-01", event="", thought="I always mess things up.", emotion_primary="Sad",
+        emotion_intensity=5, cbt_distortion="Overgeneralization", reframing="One bad day is not every day.",
+    )
+    template = sum(len(m["content"]) for m in reflection.build_messages(blank))
+
+    def entry_for(record):
+        return replace(blank, event=_filler(4 * (record.get("prompt_tokens") or 0) - template))
+
+    async def reflect(record, script_id):
+        key = script_key(script_id, _script(record, _completion(record)))
+        await asyncio.to_thread(reflection.generate_reflection, entry_for(record), key, record.get("model"))
+
+    async def stream(record, script_id):
+        key = script_key(script_id, _script(record, _completion(record)))
+        if record.get("cache_hit"):
+            await service.get_client(key)  # a returning user: their client is already pooled
+        async for _ in service.stream_reflection(entry_for(record), key, record.get("model")):
+            pass
+
+    async def backfill(record, script_id):
+        retries = record.get("retries") or 0
+        # Each failed attempt is a reflection whose SDK retries all failed too
+        failures = retries * (DEFAULT_MAX_RETRIES + 1)
+        key = script_key(script_id, _script(record, _completion(record), failures))
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "journal.jsonl"
+            overwrite_jsonl([entry_for(record)], path)
+            await backfill_reflections(
+                key, path, concurrency=1, model=record.get("model"), service=service,
+                max_retries=retries if record.get("error") else max(retries, BACKFILL_MAX_RETRIES),
+            )
+
+    return {"reflection": reflect, "reflection_stream": stream, "backfill_entry": backfill}
+
+
+def _enneagram_drivers(base_url: str, cleanup: Cleanup, rationale_tokens: int) -> Dict[str, Driver]:
+    import httpx
+
+    enneagram = _load("enneagram_app", ENNEAGRAM_APP)
+    client = httpx.AsyncClient(event_hooks=enneagram.async_httpx_event_hooks())
+    cleanup.append(client.aclose)
+
+    async def classify(record, script_id):
+        # classify -> (fallback_classify) -> rationale, one request each
+        replies = [{"reply": "unsure"}, {"reply": "4"}] if record.get("fallback") else [{"reply": "4"}]
+        steps = _script(record, replies[0]) + replies[1:] + [{"tokens": rationale_tokens}]
+        chunk = _filler(4 * (record.get("prompt_tokens") or 0))
+        await enneagram.classify_chunk_async(client, script_key(script_id, steps), chunk, base_url)
+
+    async def summary(record, script_id):
+        key = script_key(script_id, _script(record, _completion(record)))
+        counter = Counter({"Type 4": 5, "Type 9": 3, "Type 2": 2, "Unknown": 1})
+        await enneagram.generate_summary(client, key, counter, base_url)
+
+    return {"classify": classify, "summary": summary}
+
+
+def _cc_drivers(base_url: str) -> Dict[str, Driver]:
+    planner = _load("cc_planner", CC_PLANNER)
+    template = len(planner.build_prompt(planner.GenerationRequest(grade="Grade 5", subject="Math")))
+
+    async def generate_plan(record, script_id):
+        key = script_key(script_id, _script(record, _completion(record)))
+        request = planner.GenerationRequest(
+            grade="Grade 5", subject="Math",
+            description=_filler(4 * (record.get("prompt_tokens") or 0) - template),
+        )
+        await asyncio.to_thread(planner.generate_plan, request, key, record.get("model"), base_url)
+
+    return {"generate_plan": generate_plan}
+
+
+async def replay(
+    records: List[Dict[str, Any]], base_url: str, speed: float = 1.0, concurrency: int = 32
+) -> Tuple[int, List[Tuple[Dict[str, Any], BaseException]]]:
+    """
+    Replay `records` through the tools' code against `base_url`.
+
+    Args:
+        records: Trace records (only shape fields are used).
+        base_url (str): Mock server URL.
+        speed (float): Time compression; 2.0 replays twice as fast. 0 fires everything at once.
+        concurrency (int): Maximum top-level calls in flight.
+
+    Returns:
+        Tuple[int, List[Tuple[Dict[str, Any], BaseException]]]: Number of records
+            replayed directly (derived and skipped ones excluded), and the
+            records whose replay raised although none was recorded as an error,
+            with the exception.
+    """
+    rationales = [r.get("completion_tokens") or 1 for r in records if (r["tool"], r["op"]) == ("enneagram", "rationale")]
+    cleanup: Cleanup = []
+    loaders = {
+        "cbt_journal": lambda: _cbt_drivers(base_url, cleanup),
+        "enneagram": lambda: _enneagram_drivers(
+            base_url, cleanup, int(statistics.median(rationales)) if rationales else 60
+        ),
+        "cc_objectives": lambda: _cc_drivers(base_url),
+    }
+    drivers: Dict[str, Dict[str, Driver]] = {}
+    for tool in sorted({r["tool"] for r in records}):
+        if tool not in loaders:
+            print(f"warning: no replay driver for {tool!r}; skipping its records", file=sys.stderr)
+            continue
+        try:
+            drivers[tool] = loaders[tool]()
+        except ImportError as e:
+            print(f"warning: cannot import {tool} ({e}); skipping its records", file=sys.stderr)
+
+    todo = [
+        r for r in records
+        if not r.get("parent") and (r["tool"], r["op"]) not in DERIVED and r["op"] in drivers.get(r["tool"], {})
+    ]
+    slots = asyncio.Semaphore(concurrency)
+    start_ts = min((r.get("ts", 0) for r in records), default=0)
+    loop = asyncio.get_running_loop()
+    started = loop.time()
+
+    async def one(index, record):
+        if speed:
+            await asyncio.sleep(max(0.0, started + (record.get("ts", 0) - start_ts) / speed - loop.time()))
+        async with slots:
+            await drivers[record["tool"]][record["op"]](record, str(index))
+
+    try:
+        results = await asyncio.gather(*(one(i, r) for i, r in enumerate(todo)), return_exceptions=True)
+    finally:
+        for close in cleanup:
+            await close()
+    # A recorded error is reproduced by the tool raising; anything else is the replay failing
+    failures = [(r, e) for r, e in zip(todo, results) if isinstance(e, BaseException) and not r.get("error")]
+    return len(todo), failures
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("trace", nargs="?", help="Recorded trace to replay")
+    parser.add_argument("--synthetic", action="store_true", help="Replay a generated workload instead")
+    parser.add_argument("--sessions", type=int, default=20, help="Sessions per tool for --synthetic")
+    parser.add_argument("--out", help="Write the replay's own trace here")
+    parser.add_argument("--baseline", help="Earlier replay trace to compare against")
+    parser.add_argument("--threshold", type=float, default=0.2)
+    parser.add_argument("--min-calls", type=int, default=MIN_CALLS, help="Fewest calls a row needs to be compared")
+    parser.add_argument("--speed", type=float, default=1.0)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--first-token-delay", type=float, default=0.05)
+    parser.add_argument("--token-delay", type=float, default=0.002)
+    args = parser.parse_args(argv)
+    if not args.trace and not args.synthetic:
+        parser.error("give a trace file or --synthetic")
+
+    records = synthetic_workload(args.sessions) if args.synthetic else load_trace(args.trace)
+    recorder.set_trace_path(args.out)
+    recorder.reset()
+    with MockOpenAIServer(args.first_token_delay, args.token_delay) as server:
+        replayed, failures = asyncio.run(replay(records, server.base_url, args.speed, args.concurrency))
+    recorder.set_trace_path(None)
+
+    summary = recorder.snapshot()
+    flagged, skipped = {}, []
+    if args.baseline:
+        baseline = summarize(load_trace(args.baseline))
+        flagged = regressions(summary, baseline, args.threshold, args.min_calls)
+        skipped = undersampled(summary, baseline, args.min_calls)
+    print(f"replayed {replayed} of {len(records)} recorded calls directly; the rest were issued by their parent or skipped")
+    print_table(summary, flagged)
+    print_skipped(skipped, args.min_calls)
+    for record, error in failures[:10]:
+        print(f"error: {record['tool']}/{record['op']} at ts={record.get('ts', 0)}: "
+              f"{type(error).__name__}: {error}", file=sys.stderr)
+    if failures:
+        print(f"error: {len(failures)} of {replayed} replayed calls failed", file=sys.stderr)
+    return 1 if flagged or failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
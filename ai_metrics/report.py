@@ -0,0 +1,177 @@
+"""
+Summarise a JSONL call trace and flag regressions against a baseline trace.
+
+Prints one row per tool/operation: call count, wall-time and TTFB
+percentiles, average tokens, and retry / fallback / cache-hit / error rates.
+With `--baseline`, rows that got slower, more expensive or less reliable than
+the threshold allows are marked and the exit status is 1 (for CI). Rows with
+fewer than `--min-calls` calls in either trace are too noisy to judge and are
+listed as not compared instead.
+
+Usage (from the repository root):
+    python -m ai_metrics.report trace.jsonl
+    python -m ai_metrics.report new.jsonl --baseline old.jsonl --threshold 0.2 --min-calls 20
+"""
+
+import argparse
+import json
+import sys
+from typing import Any, Dict, Iterable, List, Optional
+from ai_metrics.recorder import Stats
+
+#: Metrics compared against the baseline: (summary key, kind). "ratio" metrics
+#: regress when they grow by more than the threshold; "rate" metrics when they
+#: grow by more than `RATE_SLACK` absolute.
+COMPARED = [
+    ("wall_ms_p50", "ratio"),
+    ("wall_ms_p95", "ratio"),
+    ("ttfb_ms_p50", "ratio"),
+    ("prompt_tokens_avg", "ratio"),
+    ("completion_tokens_avg", "ratio"),
+    ("retries_per_call", "rate"),
+    ("fallback_rate", "rate"),
+    ("error_rate", "rate"),
+    ("cache_hit_rate", "drop"),
+]
+RATE_SLACK = 0.05
+#: Fewest calls a row needs in both traces to be compared.
+MIN_CALLS = 20
+
+
+def load_trace(path: str) -> List[Dict[str, Any]]:
+    """
+    Read a trace file, skipping blank or torn lines.
+
+    Args:
+        path (str): JSONL file written by `ai_metrics` (`AI_METRICS_TRACE`).
+
+    Returns:
+        List[Dict[str, Any]]: One record per call.
+    """
+    records = []
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            try:
+                records.append(json.loads(line))
+            except json.JSONDecodeError:
+                continue
+    return records
+
+
+def summarize(records: Iterable[Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+    """
+    Aggregate records per tool/operation.
+
+    Returns:
+        Dict[str, Dict[str, Any]]: `Stats.summary()` keyed by "tool/op".
+    """
+    stats: Dict[str, Stats] = {}
+    for record in records:
+        stats.setdefault(f"{record['tool']}/{record['op']}", Stats()).add(record)
+    return {key: stats[key].summary() for key in sorted(stats)}
+
+
+def undersampled(
+    current: Dict[str, Dict[str, Any]], baseline: Dict[str, Dict[str, Any]], min_calls: int = MIN_CALLS
+) -> List[str]:
+    """
+    Rows in both summaries with fewer than `min_calls` calls in either.
+
+    Returns:
+        List[str]: "tool/op" keys that `regressions` does not compare.
+    """
+    return [
+        key for key, now in current.items()
+        if key in baseline and min(now["calls"], baseline[key]["calls"]) < min_calls
+    ]
+
+
+def regressions(
+    current: Dict[str, Dict[str, Any]], baseline: Dict[str, Dict[str, Any]], threshold: float = 0.2,
+    min_calls: int = MIN_CALLS,
+) -> Dict[str, List[str]]:
+    """
+    Compare two summaries.
+
+    Args:
+        current: Summary of the new trace.
+        baseline: Summary of the reference trace.
+        threshold (float): Allowed relative growth for latency and token metrics.
+        min_calls (int): Rows with fewer calls than this in either summary are
+                         skipped (see `undersampled`).
+
+    Returns:
+        Dict[str, List[str]]: Human-readable regressions keyed by "tool/op".
+    """
+    found: Dict[str, List[str]] = {}
+    skipped = set(undersampled(current, baseline, min_calls))
+    for key, now in current.items():
+        before = baseline.get(key)
+        if before is None or key in skipped:
+            continue
+        for metric, kind in COMPARED:
+            new, old = now.get(metric), before.get(metric)
+            if new is None or old is None:
+                continue
+            if kind == "ratio":
+                bad = old > 0 and new > old * (1 + threshold)
+            elif kind == "rate":
+                bad = new > old + RATE_SLACK
+            else:
+                bad = new < old - RATE_SLACK
+            if bad:
+                found.setdefault(key, []).append(f"{metric} {_fmt(old)} -> {_fmt(new)}")
+    return found
+
+
+def _fmt(value: Optional[float]) -> str:
+    if value is None:
+        return "-"
+    return f"{value:.0f}" if value >= 100 else f"{value:.2f}"
+
+
+def print_table(summary: Dict[str, Dict[str, Any]], flagged: Optional[Dict[str, List[str]]] = None) -> None:
+    """Print a summary as a fixed-width table, marking flagged rows with '!'."""
+    flagged = flagged or {}
+    print(f"  {'tool/op':<32} {'calls':>6} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'ttfb50':>8} "
+          f"{'tok in':>7} {'tok out':>7} {'retry':>6} {'fallbk':>6} {'cache':>6} {'error':>6}")
+    for key, s in summary.items():
+        mark = "!" if key in flagged else " "
+        print(f"{mark} {key:<32} {s['calls']:>6} {_fmt(s['wall_ms_p50']):>8} {_fmt(s['wall_ms_p95']):>8} "
+              f"{_fmt(s['wall_ms_p99']):>8} {_fmt(s['ttfb_ms_p50']):>8} "
+              f"{s['prompt_tokens_avg']:>7.0f} {s['completion_tokens_avg']:>7.0f} "
+              f"{s['retries_per_call']:>6.2f} {s['fallback_rate']:>6.1%} "
+              f"{s['cache_hit_rate']:>6.1%} {s['error_rate']:>6.1%}")
+    for key, problems in flagged.items():
+        print(f"! {key}: " + "; ".join(problems))
+
+
+def print_skipped(skipped: List[str], min_calls: int) -> None:
+    """Warn about rows left out of the comparison for too few calls."""
+    if skipped:
+        print(f"warning: not compared, fewer than {min_calls} calls: {', '.join(skipped)}", file=sys.stderr)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("trace", help="JSONL trace to summarise")
+    parser.add_argument("--baseline", help="Reference trace to compare against")
+    parser.add_argument("--threshold", type=float, default=0.2,
+                        help="Allowed relative growth in latency/tokens (default 0.2 = 20%%)")
+    parser.add_argument("--min-calls", type=int, default=MIN_CALLS,
+                        help=f"Fewest calls a row needs in both traces to be compared (default {MIN_CALLS})")
+    args = parser.parse_args(argv)
+
+    summary = summarize(load_trace(args.trace))
+    flagged, skipped = {}, []
+    if args.baseline:
+        baseline = summarize(load_trace(args.baseline))
+        flagged = regressions(summary, baseline, args.threshold, args.min_calls)
+        skipped = undersampled(summary, baseline, args.min_calls)
+    print_table(summary, flagged)
+    print_skipped(skipped, args.min_calls)
+    return 1 if flagged else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())